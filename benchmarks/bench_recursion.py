@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Benchmarks for the recursion solutions.
+
+Usage:
+    python benchmarks/bench_recursion.py
+
+Compares mode="recursive" with mode="iterative" on inputs the recursive
+versions can still handle, then times the iterative versions alone on
+inputs that would exceed the recursion limit.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add solutions directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'solutions'))
+
+from algorithms import recursion
+
+
+def time_call(func, *args, repeat=3, **kwargs):
+    """Best wall-clock time of func(*args, **kwargs) over a few runs, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        # Memoized functions would otherwise answer repeats from the cache.
+        getattr(func, 'cache_clear', lambda: None)()
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_modes():
+    """Recursive vs iterative on inputs within the default recursion limit."""
+    digits = random.Random(0).getrandbits(1000)
+    cases = [
+        ('fibonacci(400)', recursion.fibonacci, (400,)),
+        ('factorial(400)', recursion.factorial, (400,)),
+        ('power(3, 400)', recursion.power, (3, 400)),
+        ('sum_digits(300 digits)', recursion.sum_digits, (digits % 10**300,)),
+        ('reverse_string(900)', recursion.reverse_string, ('x' * 900,)),
+        ('tower_of_hanoi(16)', recursion.tower_of_hanoi, (16, 'A', 'C', 'B')),
+    ]
+    print(f"{'':30}{'recursive':>12}{'iterative':>12}{'speedup':>10}")
+    for name, func, args in cases:
+        recursive = time_call(func, *args, mode="recursive")
+        iterative = time_call(func, *args, mode="iterative")
+        print(f"{name:30}{recursive:12.6f}{iterative:12.6f}{recursive / iterative:9.1f}x")
+    print()
+
+
+def bench_large_inputs():
+    """Iterative versions on inputs that overflow the recursive ones."""
+    digits = random.Random(1).getrandbits(33220)
+    cases = [
+        ('fibonacci(100000)', recursion.fibonacci, (100_000,)),
+        ('factorial(5000)', recursion.factorial, (5000,)),
+        ('sum_digits(10000 digits)', recursion.sum_digits, (digits,)),
+        ('reverse_string(10**7)', recursion.reverse_string, ('x' * 10**7,)),
+        ('tower_of_hanoi(20)', recursion.tower_of_hanoi, (20, 'A', 'C', 'B')),
+    ]
+    for name, func, args in cases:
+        print(f"{name:30}{time_call(func, *args, mode='iterative'):12.6f}s")
+
+
+if __name__ == "__main__":
+    bench_modes()
+    bench_large_inputs()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Benchmarks for the searching solutions.
+
+Usage:
+    python benchmarks/bench_searching.py [size ...]
+
+Sizes default to 1e6 and 1e7; pass larger ones (up to 1e9) on a machine
+with enough memory. Prints nanoseconds per lookup for each method.
+"""
+
+import bisect
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add solutions directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'solutions'))
+
+from algorithms import searching
+
+# Scalar searches run on Python lists, which are impractical past this size.
+SCALAR_MAX_SIZE = 10**7
+
+
+def time_per_lookup(func, lookups, repeat=3):
+    """Best time of func() over a few runs, in nanoseconds per lookup."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best / lookups * 1e9
+
+
+def bench_sorted_array_index(size, queries=10**6):
+    """Compare EytzingerIndex batches with searchsorted, bisect and binary_search."""
+    rng = np.random.default_rng(0)
+    values = np.sort(rng.integers(0, 4 * size, size))
+    targets = rng.integers(0, 4 * size, queries)
+    
+    start = time.perf_counter()
+    index = searching.EytzingerIndex(values)
+    build = time.perf_counter() - start
+    
+    print(f"n = {size:.0e}  (Eytzinger build {build:.2f}s)")
+    results = {
+        'EytzingerIndex': time_per_lookup(lambda: index.lower_bound(targets), queries),
+        'np.searchsorted': time_per_lookup(lambda: np.searchsorted(values, targets), queries),
+    }
+    if size <= SCALAR_MAX_SIZE:
+        as_list = values.tolist()
+        sample = targets[:10**4].tolist()
+        results['bisect'] = time_per_lookup(
+            lambda: [bisect.bisect_left(as_list, t) for t in sample], len(sample))
+        results['binary_search'] = time_per_lookup(
+            lambda: [searching.binary_search(as_list, t) for t in sample], len(sample))
+    
+    for name, ns in results.items():
+        print(f"  {name:18}{ns:10.1f} ns/lookup")
+    print()
+
+
+if __name__ == "__main__":
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or [10**6, 10**7]
+    for size in sizes:
+        bench_sorted_array_index(size)
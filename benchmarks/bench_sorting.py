@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+Benchmarks for the sorting solutions.
+
+Usage:
+    python benchmarks/bench_sorting.py [size]
+
+Times each sorting function on sorted, reversed and random input and
+prints one row per function, in seconds.
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add solutions directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'solutions'))
+
+from algorithms import sorting
+
+
+def make_inputs(size, seed=0):
+    """Build the input distributions used by every benchmark."""
+    rng = random.Random(seed)
+    data = [rng.randint(0, size) for _ in range(size)]
+    nearly = sorted(data)
+    for _ in range(size // 100):
+        i, j = rng.randrange(size), rng.randrange(size)
+        nearly[i], nearly[j] = nearly[j], nearly[i]
+    return {
+        'sorted': sorted(data),
+        'reversed': sorted(data, reverse=True),
+        'nearly sorted': nearly,
+        'random': data,
+    }
+
+
+def time_call(func, data, repeat=3):
+    """Best wall-clock time of func(data) over a few runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_comparison_sorts(size):
+    """Compare the list-based sorts against each other and built-in sorted()."""
+    inputs = make_inputs(size)
+    funcs = {
+        'merge_sort': sorting.merge_sort,
+        'quick_sort': sorting.quick_sort,
+        'tim_sort': sorting.tim_sort,
+        'sorted': sorted,
+    }
+    
+    print(f"Comparison sorts, n = {size}")
+    print(f"{'':14}" + "".join(f"{name:>15}" for name in inputs))
+    for name, func in funcs.items():
+        row = "".join(f"{time_call(func, data):>15.4f}" for data in inputs.values())
+        print(f"{name:14}{row}")
+    print()
+
+
+def bench_array_sorts(size):
+    """Compare the NumPy counting/radix paths with NumPy's own sorts and argsorts."""
+    rng = np.random.default_rng(0)
+    inputs = {
+        'uint8': rng.integers(0, 256, size, dtype=np.uint8),
+        'ids < n': rng.integers(0, size, size),
+        '32-bit ids': rng.integers(0, 2**32, size, dtype=np.uint32),
+        '40-bit ids': rng.integers(0, 2**40, size, dtype=np.uint64),
+        'float64': rng.standard_normal(size),
+    }
+    tables = {
+        'Array sorts': {
+            'sort_array': sorting.sort_array,
+            'radix_sort': sorting.radix_sort,
+            'np default': np.sort,
+        },
+        'Stable argsorts': {
+            'radix_argsort': sorting.radix_argsort,
+            'np stable': lambda a: np.argsort(a, kind='stable'),
+        },
+    }
+    
+    for title, funcs in tables.items():
+        print(f"{title}, n = {size}")
+        print(f"{'':14}" + "".join(f"{name:>15}" for name in inputs))
+        for name, func in funcs.items():
+            row = "".join(f"{time_call(func, data):>15.4f}" for data in inputs.values())
+            print(f"{name:14}{row}")
+        print()
+
+
+def bench_parallel_sort(size, max_workers=None):
+    """Scaling of parallel_sort from one worker up to max_workers."""
+    max_workers = max_workers or os.cpu_count() or 1
+    data = np.random.default_rng(0).integers(0, 2**32, size)
+    counts = sorted({1 << k for k in range(max_workers.bit_length())} | {max_workers})
+    
+    print(f"parallel_sort scaling, n = {size}")
+    base = None
+    for workers in counts:
+        elapsed = time_call(lambda a: sorting.parallel_sort(a, workers=workers), data, repeat=1)
+        base = base or elapsed
+        print(f"{workers:>4} workers {elapsed:>10.4f}s  speedup {base / elapsed:5.2f}x")
+    print()
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    bench_comparison_sorts(size)
+    bench_array_sorts(size * 10)
+    bench_parallel_sort(size * 100)
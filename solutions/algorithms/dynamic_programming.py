@@ -2,9 +2,21 @@
 Dynamic Programming Solutions
 """
 
+import numpy as np
 
-def fibonacci_dp(n):
-    """Fibonacci with dynamic programming."""
+from .recursion import fibonacci_fast
+
+
+# Largest total the int64 knapsack tables can hold.
+_INT64_MAX = np.iinfo(np.int64).max
+
+
+def fibonacci_dp(n, mode="table"):
+    """Fibonacci with dynamic programming (mode="fast" uses fast doubling)."""
+    if mode == "fast":
+        return fibonacci_fast(n)
+    if mode != "table":
+        raise ValueError(f"unknown mode {mode!r}")
     if n <= 1:
         return n
     
@@ -17,8 +29,22 @@ def fibonacci_dp(n):
     return dp[n]
 
 
-def knapsack_01(weights, values, capacity):
-    """0/1 Knapsack problem solution."""
+def knapsack_01(weights, values, capacity, mode="table"):
+    """0/1 Knapsack problem solution.
+    
+    mode picks the engine: "table" (below), "rolling", "value",
+    "meet_in_middle", or "auto" to let knapsack_engine choose.
+    """
+    if mode == "auto":
+        mode = knapsack_engine(weights, values, capacity)
+    if mode == "rolling":
+        return knapsack_01_rolling(weights, values, capacity)
+    if mode == "value":
+        return knapsack_01_by_value(weights, values, capacity)
+    if mode == "meet_in_middle":
+        return knapsack_01_meet_in_middle(weights, values, capacity)
+    if mode != "table":
+        raise ValueError(f"unknown mode {mode!r}")
     n = len(weights)
     dp = [[0] * (capacity + 1) for _ in range(n + 1)]
     
@@ -33,6 +59,153 @@ def knapsack_01(weights, values, capacity):
     return dp[n][capacity]
 
 
+def knapsack_01_rolling(weights, values, capacity, return_items=False):
+    """0/1 knapsack with a single NumPy row of capacity + 1 best values.
+    
+    Each item is one vectorized step, best[w:] = max(best[w:], best[:-w] + v),
+    so memory is O(capacity) instead of O(n * capacity). With return_items
+    the take/skip decision of every cell is kept as a packed bitset (one
+    bit per cell) and the chosen item indices are traced back from it;
+    the result is then (best value, sorted indices).
+    """
+    if len(weights) != len(values):
+        raise ValueError("knapsack_01_rolling expects one value per weight")
+    if capacity < 0 or any(w < 0 for w in weights):
+        raise ValueError("knapsack_01_rolling expects non-negative weights and capacity")
+    # Capacity beyond the total weight of the items that fit changes nothing.
+    capacity = min(capacity, sum(w for w in weights if w <= capacity))
+    
+    # Float values stay float; ints whose total could overflow int64 fall
+    # back to objects.
+    kind = np.asarray(values).dtype.kind if len(values) else 'i'
+    if kind == 'f':
+        dtype = np.float64
+    elif kind == 'O' or sum(v for v in values if v > 0) > _INT64_MAX:
+        dtype = object
+    else:
+        dtype = np.int64
+    best = np.zeros(capacity + 1, dtype=dtype)
+    decisions = []
+    
+    for w, v in zip(weights, values):
+        if w > capacity:
+            decisions.append(None)
+            continue
+        candidate = best[:capacity + 1 - w] + v
+        current = best[w:]
+        if return_items:
+            decisions.append(np.packbits(candidate > current))
+        np.maximum(current, candidate, out=current)
+    
+    total = best[capacity:].tolist()[0]
+    if not return_items:
+        return total
+    
+    items = []
+    c = capacity
+    for i in range(len(weights) - 1, -1, -1):
+        row = decisions[i]
+        if row is None or weights[i] > c:
+            continue
+        bit = c - weights[i]
+        if row[bit >> 3] >> (7 - (bit & 7)) & 1:
+            items.append(i)
+            c -= weights[i]
+    return total, items[::-1]
+
+
+def knapsack_01_by_value(weights, values, capacity):
+    """0/1 knapsack indexed by value: O(n * sum(values)), independent of capacity.
+    
+    lightest[v] is the least weight reaching total value exactly v; each
+    item is one vectorized step, lightest[v:] = min(lightest[v:],
+    lightest[:-v] + w). The answer is the largest v whose weight fits.
+    Values must be integers; items with no positive value are never worth
+    taking and are skipped.
+    """
+    if len(weights) != len(values):
+        raise ValueError("knapsack_01_by_value expects one value per weight")
+    if any(v != int(v) for v in values):
+        raise ValueError("knapsack_01_by_value expects integer values")
+    items = [(w, int(v)) for w, v in zip(weights, values) if v > 0 and w <= capacity]
+    total = sum(v for _, v in items)
+    
+    # Any weight above capacity is as good as unreachable, which keeps the
+    # sums well inside int64.
+    unreachable = capacity + 1
+    lightest = np.full(total + 1, unreachable, dtype=np.int64)
+    lightest[0] = 0
+    for w, v in items:
+        candidate = np.minimum(lightest[:total + 1 - v] + w, unreachable)
+        np.minimum(lightest[v:], candidate, out=lightest[v:])
+    return int(np.flatnonzero(lightest <= capacity)[-1])
+
+
+def knapsack_01_meet_in_middle(weights, values, capacity):
+    """0/1 knapsack for up to about 40 items by meet in the middle: O(2**(n/2) * n).
+    
+    Every subset of each half is enumerated as (weight, value) arrays. The
+    second half is sorted by weight with a running maximum of value, so
+    the best partner of each first-half subset is one binary search away.
+    """
+    if len(weights) != len(values):
+        raise ValueError("knapsack_01_meet_in_middle expects one value per weight")
+    half = len(weights) // 2
+    first_w, first_v = _subset_sums(weights[:half], values[:half])
+    second_w, second_v = _subset_sums(weights[half:], values[half:])
+    
+    order = np.argsort(second_w, kind='stable')
+    second_w = second_w[order]
+    best_second = np.maximum.accumulate(second_v[order])
+    
+    fits = first_w <= capacity
+    partner = np.searchsorted(second_w, capacity - first_w[fits], side='right') - 1
+    # The empty subset (weight 0) always fits, so partner is never -1.
+    totals = first_v[fits] + best_second[partner]
+    # tolist() gives a Python number for int64, float64 and object arrays alike.
+    return totals.max(keepdims=True).tolist()[0]
+
+
+def _subset_sums(weights, values):
+    """Total weight and value of every subset, as two arrays of length 2**len(weights)."""
+    if any(isinstance(v, float) for v in values):
+        dtype = np.float64
+    else:
+        dtype = _int_dtype(values)
+    sub_w = np.zeros(1, dtype=_int_dtype(weights))
+    sub_v = np.zeros(1, dtype=dtype)
+    for w, v in zip(weights, values):
+        sub_w = np.concatenate((sub_w, sub_w + w))
+        sub_v = np.concatenate((sub_v, sub_v + v))
+    return sub_w, sub_v
+
+
+def _int_dtype(numbers):
+    """np.int64 if every partial sum of numbers fits in it, else object."""
+    return np.int64 if sum(abs(x) for x in numbers) <= _INT64_MAX else object
+
+
+# Largest item count knapsack_engine sends to meet in the middle; past it
+# the 2**(n/2) subset arrays stop fitting in memory.
+MEET_IN_MIDDLE_MAX_ITEMS = 44
+
+
+def knapsack_engine(weights, values, capacity):
+    """Name of the cheapest knapsack_01 engine for this instance.
+    
+    Estimated work: n * capacity cells for "rolling" (capacity clipped to
+    the total weight that fits), n * sum(values) for "value" (integer values only),
+    and n * 2**(n/2) for "meet_in_middle" (n <= MEET_IN_MIDDLE_MAX_ITEMS).
+    """
+    n = len(weights)
+    costs = {"rolling": n * (min(capacity, sum(w for w in weights if w <= capacity)) + 1)}
+    if all(v == int(v) for v in values):
+        costs["value"] = n * (sum(v for v in values if v > 0) + 1)
+    if n <= MEET_IN_MIDDLE_MAX_ITEMS:
+        costs["meet_in_middle"] = n * 2 ** ((n + 1) // 2)
+    return min(costs, key=costs.get)
+
+
 def longest_common_subsequence(str1, str2):
     """Longest common subsequence solution."""
     m, n = len(str1), len(str2)
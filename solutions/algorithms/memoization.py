@@ -0,0 +1,240 @@
+"""
+Memoization Solutions
+"""
+
+import copy
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'currsize', 'maxsize', 'bytes'])
+
+
+# Results of these types are cached and returned as they are; anything else
+# is deep-copied in and out so callers cannot mutate cached entries.
+_IMMUTABLE_TYPES = (int, float, complex, str, bytes, frozenset, type(None))
+
+
+class _KwargsMark:
+    """Separates positional from keyword arguments in cache keys (pickles by name)."""
+
+
+def memoize(func=None, *, maxsize=128, maxbytes=None, policy="lru", path=None):
+    """Memoize func with a bounded LRU or LFU cache.
+    
+    Usable bare (@memoize) or with options. maxsize bounds the number of
+    entries and maxbytes their approximate size (sys.getsizeof of key and
+    value); None leaves a bound off. List, set and dict arguments are
+    normalized to hashable keys, and argument types are part of the key;
+    calls whose arguments still cannot be hashed bypass the cache. Mutable
+    results are copied on the way in and out of the cache. With path, the
+    cache is loaded from that file if it exists and cache_save() writes it
+    back.
+    
+    The wrapper exposes cache_info(), cache_clear(), cache_save(path=None)
+    and cache_load(path=None).
+    """
+    if func is None:
+        return lambda f: memoize(f, maxsize=maxsize, maxbytes=maxbytes, policy=policy, path=path)
+    
+    cache = MemoCache(maxsize=maxsize, maxbytes=maxbytes, policy=policy)
+    
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            key = _make_key(args, kwargs)
+            hash(key)
+        except TypeError:
+            cache.record_miss()
+            return func(*args, **kwargs)
+        
+        found, value = cache.lookup(key)
+        if found:
+            return _private_copy(value)
+        value = func(*args, **kwargs)
+        cache.store(key, _private_copy(value))
+        return value
+    
+    wrapper.cache = cache
+    wrapper.cache_info = cache.info
+    wrapper.cache_clear = cache.clear
+    wrapper.cache_save = lambda path=path: cache.save(path)
+    wrapper.cache_load = lambda path=path: cache.load(path)
+    if path is not None and os.path.exists(path):
+        cache.load(path)
+    return wrapper
+
+
+class MemoCache:
+    """Thread-safe bounded cache with LRU or LFU eviction and hit/miss counters.
+    
+    LFU keeps one insertion-ordered bucket per use count, so lookups and
+    evictions stay O(1); ties are broken by least recent use.
+    """
+    
+    def __init__(self, maxsize=128, maxbytes=None, policy="lru"):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"unknown policy {policy!r}")
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.policy = policy
+        self._lock = threading.RLock()
+        self.clear()
+    
+    def __len__(self):
+        return len(self._values)
+    
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._values = {}
+            self._sizes = {}
+            self._bytes = 0
+            self._order = OrderedDict()    # LRU: key -> None, oldest first
+            self._counts = {}              # LFU: key -> use count
+            self._buckets = {}             # LFU: use count -> OrderedDict of keys
+            self._min_count = 0
+            self.hits = self.misses = self.evictions = 0
+    
+    def info(self):
+        """Counters and current size as a CacheInfo."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             len(self._values), self.maxsize, self._bytes)
+    
+    def record_miss(self):
+        """Count a call that could not use the cache."""
+        with self._lock:
+            self.misses += 1
+    
+    def lookup(self, key):
+        """(True, value) on a hit, (False, None) on a miss."""
+        with self._lock:
+            if key not in self._values:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            self._touch(key)
+            return True, self._values[key]
+    
+    def store(self, key, value):
+        """Insert key -> value, evicting other entries first to make room."""
+        size = sys.getsizeof(key) + sys.getsizeof(value)
+        with self._lock:
+            if key in self._values:
+                self._bytes += size - self._sizes[key]
+                self._values[key] = value
+                self._sizes[key] = size
+                self._touch(key)
+            else:
+                # Evict before inserting: under LFU the new entry has the
+                # lowest count and would otherwise be evicted straight away.
+                while self._values and self._over_limit(1, size):
+                    self._evict()
+                self._values[key] = value
+                self._sizes[key] = size
+                self._bytes += size
+                if self.policy == "lru":
+                    self._order[key] = None
+                else:
+                    self._counts[key] = 1
+                    self._buckets.setdefault(1, OrderedDict())[key] = None
+                    self._min_count = 1
+            
+            while self._values and self._over_limit():
+                self._evict()
+    
+    def _over_limit(self, extra_entries=0, extra_bytes=0):
+        if self.maxsize is not None and len(self._values) + extra_entries > self.maxsize:
+            return True
+        return self.maxbytes is not None and self._bytes + extra_bytes > self.maxbytes
+    
+    def _touch(self, key):
+        """Record a use of key."""
+        if self.policy == "lru":
+            self._order.move_to_end(key)
+            return
+        count = self._counts[key]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+    
+    def _evict(self):
+        """Remove the least recently (LRU) or least frequently (LFU) used entry."""
+        if self.policy == "lru":
+            key, _ = self._order.popitem(last=False)
+        else:
+            bucket = self._buckets[self._min_count]
+            key, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self._buckets[self._min_count]
+                self._min_count = min(self._buckets, default=0)
+            del self._counts[key]
+        del self._values[key]
+        self._bytes -= self._sizes.pop(key)
+        self.evictions += 1
+    
+    def save(self, path):
+        """Pickle the entries to path, least valuable first."""
+        if path is None:
+            raise ValueError("no cache path given")
+        with self._lock:
+            if self.policy == "lru":
+                keys = list(self._order)
+            else:
+                keys = [key for count in sorted(self._buckets) for key in self._buckets[count]]
+            items = [(key, self._values[key]) for key in keys]
+        # Write to a temporary file first so a crash never leaves a torn cache.
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(items, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    
+    def load(self, path):
+        """Store every entry pickled at path (counters are left alone)."""
+        if path is None:
+            raise ValueError("no cache path given")
+        with open(path, 'rb') as f:
+            items = pickle.load(f)
+        for key, value in items:
+            self.store(key, value)
+
+
+def _make_key(args, kwargs):
+    """Hashable cache key for a call, with mutable containers normalized."""
+    key = tuple(_normalize(arg) for arg in args)
+    if kwargs:
+        named = sorted((name, _normalize(value)) for name, value in kwargs.items())
+        key += (_KwargsMark,) + tuple(named)
+    return key
+
+
+def _normalize(value):
+    """Hashable equivalent of value, tagged with types so 1, 1.0 and True stay apart."""
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_normalize(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return (type(value), frozenset(_normalize(item) for item in value))
+    if isinstance(value, dict):
+        return (dict, frozenset((_normalize(k), _normalize(v)) for k, v in value.items()))
+    return (type(value), value)
+
+
+def _private_copy(value):
+    """value itself if it is immutable, else a deep copy callers cannot corrupt."""
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    if type(value) is tuple and all(isinstance(item, _IMMUTABLE_TYPES) for item in value):
+        return value
+    return copy.deepcopy(value)
@@ -2,44 +2,420 @@
 Recursion Solutions
 """
 
+import operator
+from collections import OrderedDict
 
-def fibonacci(n):
-    """Recursive fibonacci implementation."""
+import numpy as np
+
+from .memoization import _make_key, memoize
+
+
+def trampoline(gen):
+    """Run a generator-based recursion without growing the Python stack.
+    
+    gen is a call of a generator function that yields generators for its
+    recursive calls and returns its result; each yield evaluates to the
+    result of the yielded call. For example:
+    
+        def factorial(n):
+            if n <= 1:
+                return 1
+            return n * (yield factorial(n - 1))
+    
+        trampoline(factorial(5000))
+    """
+    stack = [gen]
+    value = None
+    while stack:
+        try:
+            call = stack[-1].send(value)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+        else:
+            stack.append(call)
+            value = None
+    return value
+
+
+def _is_iterative(mode):
+    """True for mode="iterative", False for mode="recursive"."""
+    if mode not in ("recursive", "iterative"):
+        raise ValueError(f"unknown mode {mode!r}")
+    return mode == "iterative"
+
+
+def _cache_lookup(func, *args, **kwargs):
+    """(key, found, value) for func(*args, **kwargs) in func's memoize cache."""
+    key = _make_key(args, kwargs)
+    found, value = func.cache.lookup(key)
+    return key, found, value
+
+
+@memoize
+def fibonacci(n, mode="recursive"):
+    """Recursive fibonacci implementation (mode="fast" uses fast doubling)."""
+    if mode == "fast":
+        return fibonacci_fast(n)
+    if _is_iterative(mode):
+        a, b = 0, 1
+        for _ in range(n):
+            a, b = b, a + b
+        return a if n > 0 else n
     if n <= 1:
         return n
-    return fibonacci(n - 1) + fibonacci(n - 2)
+    return _fibonacci_recursive(n - 1) + _fibonacci_recursive(n - 2)
+
+
+def _fibonacci_recursive(n):
+    """fibonacci(n) through its cache, one stack frame per level of recursion."""
+    key, found, value = _cache_lookup(fibonacci, n)
+    if found:
+        return value
+    value = n if n <= 1 else _fibonacci_recursive(n - 1) + _fibonacci_recursive(n - 2)
+    fibonacci.cache.store(key, value)
+    return value
+
 
+# Number of (F(n), F(n + 1)) pairs fibonacci_fast remembers.
+FIB_CACHE_SIZE = 64
+# Requests this close to a cached pair are reached by stepping one by one.
+FIB_STEP_LIMIT = 64
+
+_fib_pairs = OrderedDict()
+
+
+def fibonacci_fast(n):
+    """Fibonacci by fast doubling: O(log n) big-int multiplications.
+    
+    The last FIB_CACHE_SIZE (F(n), F(n + 1)) pairs are kept. A request
+    within FIB_STEP_LIMIT of a cached pair steps from it with additions; a
+    request further above one combines it with (F(d), F(d + 1)) through
+    the addition formula, which only doubles up to the smaller d.
+    """
+    return _fib_pair(n)[0]
 
-def factorial(n):
-    """Recursive factorial implementation."""
+
+def _fib_pair(n):
+    """(F(n), F(n + 1)), served from or stored in the pair cache."""
+    if n < 0:
+        raise ValueError("fibonacci_fast expects a non-negative integer")
+    pair = _fib_pairs.get(n)
+    if pair is not None:
+        _fib_pairs.move_to_end(n)
+        return pair
+    
+    below = max((m for m in _fib_pairs if m < n), default=None)
+    above = min((m for m in _fib_pairs if m > n), default=None)
+    if below is not None and n - below <= FIB_STEP_LIMIT:
+        a, b = _fib_pairs[below]
+        for _ in range(n - below):
+            a, b = b, a + b
+    elif above is not None and above - n <= FIB_STEP_LIMIT:
+        a, b = _fib_pairs[above]
+        for _ in range(above - n):
+            a, b = b - a, a
+    elif below is not None and 8 * (n - below) <= n:
+        # Only worth it while d is small: the products are as wide as F(n).
+        # F(m + d) = F(m) F(d + 1) + F(m - 1) F(d), F(m + d + 1) = F(m + 1) F(d + 1) + F(m) F(d)
+        fm, fm1 = _fib_pairs[below]
+        fd, fd1 = _fib_doubling(n - below)
+        a = fm * fd1 + (fm1 - fm) * fd
+        b = fm1 * fd1 + fm * fd
+    else:
+        a, b = _fib_doubling(n)
+    
+    _fib_pairs[n] = (a, b)
+    if len(_fib_pairs) > FIB_CACHE_SIZE:
+        _fib_pairs.popitem(last=False)
+    return a, b
+
+
+def _fib_doubling(n):
+    """(F(n), F(n + 1)) from F(2k) = F(k) (2 F(k + 1) - F(k)), F(2k + 1) = F(k)^2 + F(k + 1)^2."""
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if bit == '1':
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+
+@memoize
+def factorial(n, mode="recursive"):
+    """Recursive factorial implementation (mode="fast" uses factorial_fast)."""
+    if mode == "fast":
+        return factorial_fast(n)
+    if _is_iterative(mode):
+        result = 1
+        for i in range(2, n + 1):
+            result *= i
+        return result
     if n <= 1:
         return 1
-    return n * factorial(n - 1)
+    return n * _factorial_recursive(n - 1)
+
+
+def _factorial_recursive(n):
+    """factorial(n) through its cache, one stack frame per level of recursion."""
+    key, found, value = _cache_lookup(factorial, n)
+    if found:
+        return value
+    value = 1 if n <= 1 else n * _factorial_recursive(n - 1)
+    factorial.cache.store(key, value)
+    return value
+
+
+# factorial_fast answers n below this from a precomputed table.
+FACTORIAL_TABLE_SIZE = 256
+
+_factorials = [1]
+for _i in range(1, FACTORIAL_TABLE_SIZE):
+    _factorials.append(_factorials[-1] * _i)
+del _i
+
+
+def factorial_fast(n):
+    """Factorial by Luschny's split-recursive product: near-linear in the digits.
+    
+    n! = 2**(n - popcount(n)) times the odd part. Going over the bits of n
+    from the top, m = n >> i grows by about a factor of two each step; the
+    odd numbers in the new range (m / 2, m] multiply into a running product
+    p, and r collects p at every step. Each odd product is formed by binary
+    splitting, so the big multiplications are between similar-sized
+    numbers instead of a huge accumulator times a small int.
+    """
+    if n < 0:
+        raise ValueError("factorial_fast expects a non-negative integer")
+    if n < FACTORIAL_TABLE_SIZE:
+        return _factorials[n]
+    
+    p = r = 1
+    last = 1
+    for i in range(n.bit_length() - 1, -1, -1):
+        m = n >> i
+        top = m if m & 1 else m - 1
+        if top > last:
+            p *= _odd_product(last + 2, top)
+            last = top
+        r *= p
+    return r << (n - bin(n).count('1'))
+
+
+def _odd_product(lo, hi):
+    """Product of the odd numbers lo, lo + 2, ..., hi by binary splitting."""
+    count = (hi - lo) // 2 + 1
+    if count <= 16:
+        result = 1
+        for x in range(lo, hi + 1, 2):
+            result *= x
+        return result
+    mid = lo + 2 * (count // 2)
+    return _odd_product(lo, mid - 2) * _odd_product(mid, hi)
 
 
-def power(base, exponent):
-    """Recursive power calculation."""
+@memoize
+def power(base, exponent, mode="fast", mod=None):
+    """Power calculation with fast_power (mode="recursive" is the O(n) recursion)."""
+    if mode == "fast" or mod is not None:
+        return fast_power(base, exponent, mod=mod)
+    if _is_iterative(mode):
+        result = 1
+        for _ in range(exponent):
+            result = base * result
+        return result
     if exponent == 0:
         return 1
-    return base * power(base, exponent - 1)
+    return base * _power_recursive(base, exponent - 1)
 
 
-def sum_digits(n):
+def _power_recursive(base, exponent):
+    """power(base, exponent, mode="recursive") through its cache, one frame per level."""
+    key, found, value = _cache_lookup(power, base, exponent, mode="recursive")
+    if found:
+        return value
+    value = 1 if exponent == 0 else base * _power_recursive(base, exponent - 1)
+    power.cache.store(key, value)
+    return value
+
+
+def fast_power(base, exponent, mod=None, window=None):
+    """base ** exponent with O(log exponent) multiplications.
+    
+    Numbers (ints, floats, Fractions, ...) go to the built-in pow, which
+    already squares and multiplies in C; with mod it does modular
+    exponentiation, including inverses for negative exponents. Square
+    matrices, as NumPy arrays or lists of lists, are raised by a
+    sliding-window square-and-multiply that takes window bits of the
+    exponent per extra multiplication (picked from the exponent size when
+    None). With mod, matrix entries are reduced after every product; NumPy
+    integer products must fit the dtype. Negative exponents invert NumPy
+    matrices first.
+    """
+    if isinstance(base, (np.ndarray, list)):
+        exponent = operator.index(exponent)
+    if isinstance(base, np.ndarray):
+        if base.ndim != 2 or base.shape[0] != base.shape[1]:
+            raise ValueError("fast_power expects a square matrix")
+        if exponent < 0:
+            if mod is not None:
+                raise ValueError("negative exponents with mod are not supported for matrices")
+            base, exponent = np.linalg.inv(base), -exponent
+        if mod is None:
+            multiply = np.matmul
+        else:
+            base = base % mod
+            
+            def multiply(a, b):
+                return (a @ b) % mod
+        identity = np.eye(base.shape[0], dtype=base.dtype)
+    elif isinstance(base, list):
+        if any(len(row) != len(base) for row in base):
+            raise ValueError("fast_power expects a square matrix")
+        if exponent < 0:
+            raise ValueError("negative exponents are not supported for list matrices")
+        if mod is not None:
+            base = [[x % mod for x in row] for row in base]
+        
+        def multiply(a, b):
+            return _matmul_lists(a, b, mod)
+        
+        identity = [[int(i == j) for j in range(len(base))] for i in range(len(base))]
+    elif mod is not None:
+        return pow(base, exponent, mod)
+    else:
+        return base ** exponent
+    
+    if exponent == 0:
+        return identity
+    return _window_power(base, exponent, multiply, window or _window_size(exponent.bit_length()))
+
+
+def linear_recurrence(coefficients, initial, n, mod=None):
+    """n-th term of a[k] = c[0] a[k-1] + ... + c[d-1] a[k-d] in O(d^3 log n).
+    
+    initial holds a[0] .. a[d-1]. The companion matrix is raised with
+    fast_power, so linear_recurrence([1, 1], [0, 1], n) is fibonacci(n).
+    """
+    d = len(coefficients)
+    if len(initial) != d:
+        raise ValueError("linear_recurrence expects one initial term per coefficient")
+    if n < d:
+        return initial[n] if mod is None else initial[n] % mod
+    
+    companion = [list(coefficients)] + [[int(j == i) for j in range(d)] for i in range(d - 1)]
+    row = fast_power(companion, n - d + 1, mod=mod)[0]
+    # The state vector holds a[d-1], ..., a[0], newest first.
+    term = sum(c * a for c, a in zip(row, reversed(initial)))
+    return term if mod is None else term % mod
+
+
+def _window_size(bits):
+    """Sliding-window width that minimizes multiplications for an exponent of this many bits."""
+    for width, limit in ((1, 8), (2, 24), (3, 80), (4, 240), (5, 672)):
+        if bits <= limit:
+            return width
+    return 6
+
+
+def _window_power(base, exponent, multiply, width):
+    """base ** exponent for exponent >= 1, left to right over windows of at most width bits."""
+    # Odd powers base, base^3, ..., base^(2^width - 1).
+    table = [base]
+    if width > 1:
+        square = multiply(base, base)
+        for _ in range((1 << (width - 1)) - 1):
+            table.append(multiply(table[-1], square))
+    
+    result = None
+    i = exponent.bit_length() - 1
+    while i >= 0:
+        if not (exponent >> i) & 1:
+            result = multiply(result, result)
+            i -= 1
+            continue
+        # The longest window ending in a set bit, starting at bit i.
+        j = max(i - width + 1, 0)
+        while not (exponent >> j) & 1:
+            j += 1
+        value = (exponent >> j) & ((1 << (i - j + 1)) - 1)
+        if result is None:
+            result = table[value >> 1]
+        else:
+            for _ in range(i - j + 1):
+                result = multiply(result, result)
+            result = multiply(result, table[value >> 1])
+        i = j - 1
+    return result
+
+
+def _matmul_lists(a, b, mod=None):
+    """Product of two list-of-lists matrices, reduced modulo mod if given."""
+    columns = list(zip(*b))
+    if mod is None:
+        return [[sum(x * y for x, y in zip(row, col)) for col in columns] for row in a]
+    return [[sum(x * y for x, y in zip(row, col)) % mod for col in columns] for row in a]
+
+
+# sum_digits(mode="iterative") sums the digits of pieces this many digits long.
+SUM_DIGITS_CHUNK = 18
+
+
+def sum_digits(n, mode="recursive"):
     """Recursive sum of digits."""
+    if _is_iterative(mode):
+        return _sum_digits_split(n)
     if n < 10:
         return n
     return n % 10 + sum_digits(n // 10)
 
 
-def reverse_string(s):
+def _sum_digits_split(n):
+    """Sum of digits by splitting n at 10**(SUM_DIGITS_CHUNK * 2**k) down to small pieces.
+    
+    Halving the size at each level needs far fewer big-int divisions than
+    peeling off one chunk at a time, and the explicit stack stays
+    O(log digits) deep.
+    """
+    if n < 10:
+        return n
+    powers = [10 ** SUM_DIGITS_CHUNK]
+    while powers[-1] * powers[-1] <= n:
+        powers.append(powers[-1] * powers[-1])
+    
+    total = 0
+    stack = [(n, len(powers) - 1)]
+    while stack:
+        value, level = stack.pop()
+        if level < 0:
+            total += sum(map(int, str(value)))
+        elif value < powers[level]:
+            stack.append((value, level - 1))
+        else:
+            high, low = divmod(value, powers[level])
+            stack.append((high, level - 1))
+            stack.append((low, level - 1))
+    return total
+
+
+def reverse_string(s, mode="recursive"):
     """Recursive string reversal."""
+    if _is_iterative(mode):
+        return s[::-1]
     if len(s) <= 1:
         return s
     return s[-1] + reverse_string(s[:-1])
 
 
-def tower_of_hanoi(n, source, destination, auxiliary):
-    """Tower of Hanoi solution."""
+def tower_of_hanoi(n, source, destination, auxiliary, mode="recursive"):
+    """Tower of Hanoi solution (mode="generator" yields the moves lazily)."""
+    if mode == "generator":
+        return hanoi_moves(n, source, destination, auxiliary)
+    if _is_iterative(mode):
+        return list(hanoi_moves(n, source, destination, auxiliary))
     if n == 1:
         return [(source, destination)]
     
@@ -52,3 +428,54 @@ def tower_of_hanoi(n, source, destination, auxiliary):
     moves.extend(tower_of_hanoi(n - 1, auxiliary, destination, source))
     
     return moves
+
+
+def hanoi_moves(n, source, destination, auxiliary, start=0):
+    """Yield the Tower of Hanoi moves from the start-th on, in O(1) memory per move.
+    
+    Move m (counting from 1) takes a disk from peg (m & (m - 1)) % 3 to
+    ((m | (m - 1)) + 1) % 3, numbering the pegs so that the tower ends up
+    on the destination for either parity of n.
+    """
+    pegs = _hanoi_pegs(n, source, destination, auxiliary)
+    for m in range(start + 1, 1 << n):
+        yield pegs[(m & (m - 1)) % 3], pegs[((m | (m - 1)) + 1) % 3]
+
+
+def hanoi_move(n, k, source, destination, auxiliary):
+    """The k-th move (from 0) of the n-disk solution, without enumerating the others."""
+    if not 0 <= k < (1 << n) - 1:
+        raise IndexError("hanoi move index out of range")
+    pegs = _hanoi_pegs(n, source, destination, auxiliary)
+    m = k + 1
+    return pegs[(m & (m - 1)) % 3], pegs[((m | (m - 1)) + 1) % 3]
+
+
+def hanoi_state(n, k, source, destination, auxiliary):
+    """Disks on each peg after the first k moves, bottom to top, in O(n).
+    
+    Working down from the largest disk: during the first 2**(d - 1) moves
+    of a d-disk transfer disk d is still on its source and the rest move to
+    the spare peg; afterwards it sits on the target and the rest move on
+    from the spare peg.
+    """
+    if not 0 <= k < 1 << n:
+        raise IndexError("hanoi move count out of range")
+    state = {source: [], destination: [], auxiliary: []}
+    for disk in range(n, 0, -1):
+        half = 1 << (disk - 1)
+        if k < half:
+            state[source].append(disk)
+            destination, auxiliary = auxiliary, destination
+        else:
+            state[destination].append(disk)
+            k -= half
+            source, auxiliary = auxiliary, source
+    return state
+
+
+def _hanoi_pegs(n, source, destination, auxiliary):
+    """Pegs in the numbering used by the move formula."""
+    if n % 2:
+        return source, auxiliary, destination
+    return source, destination, auxiliary
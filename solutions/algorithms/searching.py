@@ -2,6 +2,16 @@
 Searching Algorithms Solutions
 """
 
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from itertools import accumulate, chain, islice
+
+import numpy as np
+
 
 def linear_search(arr, target):
     """Linear search implementation."""
@@ -11,6 +21,217 @@ def linear_search(arr, target):
     return -1
 
 
+# adaptive_linear_search builds a hash index once a sequence has been
+# searched this many times.
+LINEAR_INDEX_THRESHOLD = 8
+# Number of sequences adaptive_linear_search keeps indexes for.
+LINEAR_INDEX_CACHE_SIZE = 16
+# Sequences that cannot change behind a cached index.
+_IMMUTABLE_SEQUENCES = (tuple, str, bytes)
+
+_linear_indexes = OrderedDict()
+
+
+def adaptive_linear_search(arr, target, threshold=LINEAR_INDEX_THRESHOLD):
+    """linear_search that switches to a hash index for sequences searched often.
+    
+    A LinearSearchIndex answers from its own index, which tracks mutations.
+    Ranges are answered in O(1) by range.index. For immutable sequences
+    (tuples, strings, bytes) the first threshold - 1 searches scan; after
+    that a value -> first index map is built once and each search is O(1)
+    (the LINEAR_INDEX_CACHE_SIZE most recently used are kept). Lists and other mutable sequences
+    are always scanned, since an in-place edit could not be detected;
+    wrap them in a LinearSearchIndex to get the O(1) lookups.
+    """
+    if isinstance(arr, LinearSearchIndex):
+        return arr.find(target)
+    if isinstance(arr, range):
+        try:
+            return arr.index(target)
+        except ValueError:
+            return -1
+    if not isinstance(arr, _IMMUTABLE_SEQUENCES):
+        return linear_search(arr, target)
+    
+    entry = _linear_indexes.get(id(arr))
+    if entry is None:
+        # The entry keeps arr alive, so its id cannot be reused meanwhile.
+        entry = {'seq': arr, 'queries': 0, 'index': None}
+        _linear_indexes[id(arr)] = entry
+        if len(_linear_indexes) > LINEAR_INDEX_CACHE_SIZE:
+            _linear_indexes.popitem(last=False)
+    else:
+        _linear_indexes.move_to_end(id(arr))
+    
+    entry['queries'] += 1
+    if entry['index'] is None:
+        if entry['queries'] < threshold:
+            return linear_search(arr, target)
+        entry['index'] = _first_positions(arr)
+    
+    index = entry['index']
+    if index is False:
+        return linear_search(arr, target)
+    try:
+        i = index.get(target, -1)
+    except TypeError:
+        return linear_search(arr, target)
+    if i >= 0 and not arr[i] == target:
+        # Dicts match by identity first, so a NaN finds itself where == fails.
+        return linear_search(arr, target)
+    return i
+
+
+def clear_linear_search_cache():
+    """Forget every index built by adaptive_linear_search."""
+    _linear_indexes.clear()
+
+
+def _first_positions(seq):
+    """Map each value of seq to its first index, or False if a value is unhashable."""
+    positions = {}
+    try:
+        for i, value in enumerate(seq):
+            positions.setdefault(value, i)
+    except TypeError:
+        return False
+    return positions
+
+
+class LinearSearchIndex:
+    """A list with a value -> indices hash index for repeated lookups.
+    
+    The index is built on the first lookup. append, extend and item
+    assignment update it in place; operations that shift positions
+    (insert, pop, remove, del, sort, ...) drop it until the next lookup.
+    Unhashable values fall back to linear_search.
+    """
+    
+    def __init__(self, iterable=()):
+        self._items = list(iterable)
+        self._positions = None
+    
+    def __len__(self):
+        return len(self._items)
+    
+    def __iter__(self):
+        return iter(self._items)
+    
+    def __getitem__(self, index):
+        return self._items[index]
+    
+    def __contains__(self, value):
+        return self.find(value) != -1
+    
+    def __repr__(self):
+        return f"LinearSearchIndex({self._items!r})"
+    
+    def _index(self):
+        """The value -> ascending indices map, built if needed (None if unhashable)."""
+        if self._positions is None:
+            positions = {}
+            try:
+                for i, value in enumerate(self._items):
+                    positions.setdefault(value, []).append(i)
+            except TypeError:
+                return None
+            self._positions = positions
+        return self._positions
+    
+    def find(self, target):
+        """Index of the first occurrence of target, or -1."""
+        indices = self.find_all(target)
+        return indices[0] if indices else -1
+    
+    def find_all(self, target):
+        """Every index holding target, in ascending order."""
+        index = self._index()
+        try:
+            if index is not None:
+                indices = index.get(target, ())
+                # Dicts match by identity first, so a NaN finds itself where == fails.
+                if not indices or self._items[indices[0]] == target:
+                    return list(indices)
+        except TypeError:
+            pass
+        return [i for i, value in enumerate(self._items) if value == target]
+    
+    def append(self, value):
+        """Append value, extending the index if it is built."""
+        self._items.append(value)
+        if self._positions is not None:
+            try:
+                self._positions.setdefault(value, []).append(len(self._items) - 1)
+            except TypeError:
+                self._positions = None
+    
+    def extend(self, values):
+        """Append every value."""
+        # Snapshot first: extending by self would otherwise never finish.
+        for value in list(values):
+            self.append(value)
+    
+    def __setitem__(self, index, value):
+        if isinstance(index, slice) or self._positions is None:
+            self._items[index] = value
+            self._positions = None
+            return
+        
+        # Normalizes negative indices and raises IndexError before any change.
+        index = range(len(self._items))[index]
+        old = self._items[index]
+        self._items[index] = value
+        try:
+            indices = self._positions[old]
+            indices.remove(index)
+            if not indices:
+                del self._positions[old]
+            insort(self._positions.setdefault(value, []), index)
+        except TypeError:
+            self._positions = None
+    
+    def __delitem__(self, index):
+        del self._items[index]
+        self._positions = None
+    
+    def insert(self, index, value):
+        """Insert value before index."""
+        self._items.insert(index, value)
+        self._positions = None
+    
+    def pop(self, index=-1):
+        """Remove and return the item at index."""
+        if index == -1 or index == len(self._items) - 1:
+            value = self._items[-1]
+            if self._positions is not None:
+                self._positions[value].pop()
+                if not self._positions[value]:
+                    del self._positions[value]
+            return self._items.pop()
+        self._positions = None
+        return self._items.pop(index)
+    
+    def remove(self, value):
+        """Remove the first occurrence of value."""
+        self._items.remove(value)
+        self._positions = None
+    
+    def clear(self):
+        """Remove every item."""
+        self._items.clear()
+        self._positions = None
+    
+    def sort(self, key=None, reverse=False):
+        """Sort the items in place."""
+        self._items.sort(key=key, reverse=reverse)
+        self._positions = None
+    
+    def reverse(self):
+        """Reverse the items in place."""
+        self._items.reverse()
+        self._positions = None
+
+
 def binary_search(arr, target):
     """Binary search implementation."""
     left, right = 0, len(arr) - 1
@@ -61,3 +282,611 @@ def find_first_occurrence(arr, target):
             right = mid - 1
     
     return result
+
+
+def binary_search_iterative(arr, target, left=0, right=None, key=None):
+    """Loop-based drop-in for binary_search_recursive (same probes, same result).
+    
+    With key, elements are compared as key(element) and target is a key.
+    """
+    if right is None:
+        right = len(arr) - 1
+    
+    while left <= right:
+        mid = (left + right) // 2
+        value = arr[mid] if key is None else key(arr[mid])
+        if value == target:
+            return mid
+        elif value < target:
+            left = mid + 1
+        else:
+            right = mid - 1
+    
+    return -1
+
+
+def lower_bound(arr, target, key=None):
+    """Index of the first element >= target, or len(arr) if there is none.
+    
+    With key, elements are compared as key(element) and target is a key.
+    """
+    return bisect_left(arr, target, key=key)
+
+
+def upper_bound(arr, target, key=None):
+    """Index of the first element > target, or len(arr) if there is none."""
+    return bisect_right(arr, target, key=key)
+
+
+def equal_range(arr, target, key=None):
+    """(first, last + 1) indices of the run of elements equal to target."""
+    first = bisect_left(arr, target, key=key)
+    return first, bisect_right(arr, target, first, key=key)
+
+
+def count_in_range(arr, lo, hi, key=None):
+    """Number of elements x with lo <= x < hi, in O(log n)."""
+    if not lo < hi:
+        return 0
+    first = bisect_left(arr, lo, key=key)
+    return bisect_left(arr, hi, first, key=key) - first
+
+
+def interpolation_search(arr, target):
+    """Interpolation search on a sorted numeric sequence.
+    
+    Each probe is placed where target would sit if the values between the
+    current bounds were evenly spaced, which takes O(log log n) probes on
+    near-uniform data. When a probe fails to halve the range the next one
+    is a plain binary step, so skewed data costs at most about twice
+    binary_search.
+    """
+    left, right = 0, len(arr) - 1
+    bisect_next = False
+    
+    while left <= right:
+        low, high = arr[left], arr[right]
+        if target < low or high < target:
+            return -1
+        if low == high:
+            return left
+        
+        size = right - left
+        if bisect_next:
+            mid = (left + right) // 2
+        else:
+            # Python numbers, so NumPy int64 products cannot overflow.
+            low, high, goal = _scalar(low), _scalar(high), _scalar(target)
+            mid = min(left + int((goal - low) * size // (high - low)), right)
+        
+        value = arr[mid]
+        if value == target:
+            return mid
+        elif value < target:
+            left = mid + 1
+        else:
+            right = mid - 1
+        bisect_next = not bisect_next and right - left > size // 2
+    
+    return -1
+
+
+def exponential_search(arr, target):
+    """Exponential (galloping) search on a sorted sequence.
+    
+    Doubles a bound until it passes target, then binary searches the last
+    doubling, so finding index i costs O(log i). arr need not have a
+    length: an IndexError marks its end, which suits unbounded inputs.
+    """
+    bound = 1
+    while True:
+        value = _probe(arr, bound - 1)
+        if value is _MISSING or not value < target:
+            break
+        bound *= 2
+    
+    left, right = bound // 2, bound - 1
+    while left <= right:
+        mid = (left + right) // 2
+        value = _probe(arr, mid)
+        if value is _MISSING or target < value:
+            right = mid - 1
+        elif value < target:
+            left = mid + 1
+        else:
+            return mid
+    
+    return -1
+
+
+_MISSING = object()
+
+
+def _probe(arr, index):
+    """arr[index], or _MISSING past the end of arr."""
+    try:
+        return arr[index]
+    except IndexError:
+        return _MISSING
+
+
+# Largest deviation from a straight line, as a fraction of the value range,
+# for which choose_search still picks interpolation search.
+INTERPOLATION_MAX_DEVIATION = 0.1
+
+
+def choose_search(arr, samples=32):
+    """Pick interpolation_search or binary_search for a sorted sequence.
+    
+    Samples evenly spaced positions and measures how far their values stray
+    from the line between the first and last value. Near-uniform numeric
+    data gets interpolation_search, anything else binary_search. Call it
+    once per array and reuse the returned function.
+    """
+    n = len(arr)
+    if n < samples:
+        return binary_search
+    try:
+        first = _scalar(arr[0])
+        span = _scalar(arr[-1]) - first
+        if not span > 0:
+            return binary_search
+        deviation = max(
+            abs((_scalar(arr[i]) - first) / span - i / (n - 1))
+            for i in ((n - 1) * k // (samples - 1) for k in range(samples))
+        )
+    except TypeError:
+        return binary_search
+    
+    return interpolation_search if deviation <= INTERPOLATION_MAX_DEVIATION else binary_search
+
+
+def _scalar(value):
+    """value as a Python number if it is a NumPy scalar."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def binary_search_batch(arr, targets, mode="any"):
+    """Binary search a sorted array for many targets in one vectorized pass.
+    
+    Returns an index array shaped like targets, with -1 for misses. mode
+    picks which index of a duplicated value is returned: "first", "last",
+    or "any" (currently the first, like find_first_occurrence).
+    """
+    if mode not in ("any", "first", "last"):
+        raise ValueError(f"unknown mode {mode!r}")
+    arr, targets = np.asarray(arr), np.asarray(targets)
+    if arr.size == 0:
+        return np.full(targets.shape, -1, dtype=np.intp)
+    
+    if mode == "last":
+        idx = np.searchsorted(arr, targets, side='right') - 1
+    else:
+        idx = np.searchsorted(arr, targets, side='left')
+    idx = np.clip(idx, 0, arr.size - 1)
+    return np.where(arr[idx] == targets, idx, -1)
+
+
+class SortedArray:
+    """Sorted container stored as a list of bounded-size sorted blocks.
+    
+    Searches bisect the block maxima and then a single block, so index,
+    bisect_left/right, count and range queries are O(log n) once the block
+    offsets are built; they are rebuilt lazily, in O(n / load), after a
+    mutation. add and remove shift at most 2 * load items of one block,
+    which is O(sqrt n) with load around sqrt n. With a typecode (as for
+    array.array, e.g. 'q' or 'd') each block is a compact array.array.
+    """
+    
+    def __init__(self, iterable=(), typecode=None, load=1000):
+        self._typecode = typecode
+        self._load = load
+        self._blocks = []
+        self._maxes = []
+        self._offsets = None
+        self._len = 0
+        self.update(iterable)
+    
+    def __len__(self):
+        return self._len
+    
+    def __iter__(self):
+        return chain.from_iterable(self._blocks)
+    
+    def __contains__(self, value):
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return False
+        block = self._blocks[i]
+        return block[bisect_left(block, value)] == value
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1:
+                return list(self)[index]
+            return self._slice(start, stop)
+        
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("SortedArray index out of range")
+        i = bisect_right(self._block_offsets(), index) - 1
+        return self._blocks[i][index - self._offsets[i]]
+    
+    def __repr__(self):
+        return f"SortedArray({list(self)!r})"
+    
+    def _new_block(self, values):
+        """A block holding values, compact when the container has a typecode."""
+        return array(self._typecode, values) if self._typecode else list(values)
+    
+    def _block_offsets(self):
+        """Position of the first item of every block, rebuilt after mutations."""
+        if self._offsets is None:
+            self._offsets = [0] + list(accumulate(len(block) for block in self._blocks))[:-1]
+        return self._offsets
+    
+    def _slice(self, start, stop):
+        """Items with positions in [start, stop) as a list."""
+        if start >= stop:
+            return []
+        offsets = self._block_offsets()
+        i = bisect_right(offsets, start) - 1
+        items = chain.from_iterable(self._blocks[i:])
+        return list(islice(items, start - offsets[i], stop - offsets[i]))
+    
+    def clear(self):
+        """Remove every item."""
+        self._blocks, self._maxes = [], []
+        self._offsets = None
+        self._len = 0
+    
+    def update(self, iterable):
+        """Add every item of iterable, rebuilding the blocks in one pass."""
+        values = sorted(chain(self, iterable))
+        load = self._load
+        self._blocks = [self._new_block(values[i:i + load]) for i in range(0, len(values), load)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._offsets = None
+        self._len = len(values)
+    
+    def add(self, value):
+        """Insert value, keeping the container sorted."""
+        if not self._blocks:
+            self._blocks.append(self._new_block([value]))
+            self._maxes.append(value)
+        else:
+            i = bisect_right(self._maxes, value)
+            if i == len(self._maxes):
+                i -= 1
+                self._blocks[i].append(value)
+                self._maxes[i] = value
+            else:
+                insort(self._blocks[i], value)
+            
+            block = self._blocks[i]
+            if len(block) > 2 * self._load:
+                half = block[self._load:]
+                del block[self._load:]
+                self._blocks.insert(i + 1, half)
+                self._maxes.insert(i, block[-1])
+        
+        self._offsets = None
+        self._len += 1
+    
+    def discard(self, value):
+        """Remove one occurrence of value if present; return whether it was."""
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return False
+        block = self._blocks[i]
+        j = bisect_left(block, value)
+        if block[j] != value:
+            return False
+        
+        del block[j]
+        self._offsets = None
+        self._len -= 1
+        if not block:
+            del self._blocks[i]
+            del self._maxes[i]
+        else:
+            self._maxes[i] = block[-1]
+            if len(block) < self._load // 2 and len(self._blocks) > 1:
+                self._merge_block(i)
+        return True
+    
+    def remove(self, value):
+        """Remove one occurrence of value; raise ValueError if it is missing."""
+        if not self.discard(value):
+            raise ValueError(f"{value!r} not in SortedArray")
+    
+    def _merge_block(self, i):
+        """Fold the undersized block i into a neighbour, splitting it if it grows too big."""
+        if i == len(self._blocks) - 1:
+            i -= 1
+        block = self._blocks[i]
+        block.extend(self._blocks.pop(i + 1))
+        del self._maxes[i]
+        if len(block) > 2 * self._load:
+            half = block[len(block) // 2:]
+            del block[len(block) // 2:]
+            self._blocks.insert(i + 1, half)
+            self._maxes.insert(i, block[-1])
+    
+    def bisect_left(self, value):
+        """Position of the first item >= value."""
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return self._len
+        return self._block_offsets()[i] + bisect_left(self._blocks[i], value)
+    
+    def bisect_right(self, value):
+        """Position after the last item <= value."""
+        i = bisect_right(self._maxes, value)
+        if i == len(self._maxes):
+            return self._len
+        return self._block_offsets()[i] + bisect_right(self._blocks[i], value)
+    
+    def index(self, value):
+        """Position of the first occurrence of value; ValueError if missing."""
+        pos = self.bisect_left(value)
+        if pos == self._len or self[pos] != value:
+            raise ValueError(f"{value!r} not in SortedArray")
+        return pos
+    
+    def count(self, value):
+        """Number of occurrences of value."""
+        return self.bisect_right(value) - self.bisect_left(value)
+    
+    def irange(self, minimum=None, maximum=None):
+        """Items with minimum <= item <= maximum as a list (None leaves a side open)."""
+        start = 0 if minimum is None else self.bisect_left(minimum)
+        stop = self._len if maximum is None else self.bisect_right(maximum)
+        return self._slice(start, stop)
+
+
+class EytzingerIndex:
+    """Batch search index over a sorted array stored in Eytzinger (BFS) order.
+    
+    The sorted values are laid out as an implicit binary search tree: the
+    root at slot 1 and the children of slot k at 2k and 2k + 1. The top of
+    the tree is packed into a few cache lines that every query shares, and
+    the descent needs no bounds checks, so a batch of queries runs as
+    log2(n) vectorized steps. Results are positions in the original
+    sorted order.
+    """
+    
+    def __init__(self, sorted_arr):
+        values = np.asarray(sorted_arr)
+        if values.ndim != 1:
+            raise ValueError("EytzingerIndex expects a 1-D sorted array")
+        n = values.size
+        self._n = n
+        self._depth = n.bit_length()
+        
+        # In a perfect tree of 2**depth - 1 slots, slot k at level d with
+        # offset j has in-order position (2j + 1) * 2**(depth - 1 - d) - 1.
+        # Visiting the real slots 1..n in that order assigns sorted ranks.
+        slots = np.arange(1, n + 1)
+        level = np.frexp(slots)[1] - 1
+        inorder = (2 * (slots - (1 << level)) + 1) * (1 << (self._depth - 1 - level)) - 1
+        by_position = np.zeros(1 << self._depth, dtype=np.intp)
+        by_position[inorder] = slots
+        order = by_position[by_position > 0]
+        
+        # Padding slots hold a value below every target so that a descent
+        # passing through them recovers the right answer.
+        self._tree = np.full(1 << self._depth, _sorts_first(values.dtype), dtype=values.dtype)
+        self._tree[order] = values
+        self._rank = np.full(1 << self._depth, n, dtype=np.intp)
+        self._rank[order] = np.arange(n)
+    
+    def __len__(self):
+        return self._n
+    
+    def _descend(self, targets):
+        """Tree slot of the first value >= each target (0 if there is none)."""
+        slot = np.ones(targets.shape, dtype=np.intp)
+        tree = self._tree
+        for _ in range(self._depth):
+            slot = 2 * slot + (tree[slot] < targets)
+        # Undo the right turns taken after the answer and the final left turn.
+        lowest_zero = (slot + 1) & -(slot + 1)
+        return slot // (2 * lowest_zero)
+    
+    def lower_bound(self, targets):
+        """Position of the first value >= each target (len if there is none)."""
+        targets = np.asarray(targets)
+        if self._n == 0:
+            return np.zeros(targets.shape, dtype=np.intp)
+        return self._rank[self._descend(targets)]
+    
+    def search(self, targets):
+        """Position of the first occurrence of each target, or -1 if missing."""
+        targets = np.asarray(targets)
+        if self._n == 0:
+            return np.full(targets.shape, -1, dtype=np.intp)
+        slot = self._descend(targets)
+        found = (slot > 0) & (self._tree[slot] == targets)
+        return np.where(found, self._rank[slot], -1)
+
+
+def _sorts_first(dtype):
+    """A padding value that no value of dtype sorts before."""
+    if dtype.kind == 'f':
+        return -np.inf
+    if dtype.kind in 'iu':
+        return np.iinfo(dtype).min
+    if dtype.kind == 'b':
+        return False
+    raise ValueError("EytzingerIndex expects a numeric array")
+
+
+# struct codes for NumPy key fields, by (kind, itemsize).
+_STRUCT_CODES = {
+    ('i', 1): 'b', ('i', 2): 'h', ('i', 4): 'i', ('i', 8): 'q',
+    ('u', 1): 'B', ('u', 2): 'H', ('u', 4): 'I', ('u', 8): 'Q',
+    ('f', 4): 'f', ('f', 8): 'd',
+}
+
+
+class MappedSortedFile:
+    """Binary search over a memory-mapped file of fixed-width records sorted by key.
+    
+    Records are described either by a NumPy dtype (key is a field name, or
+    None for a plain scalar dtype) or by a struct format string (key is the
+    index of the field in the unpacked tuple). Only the key bytes of the
+    probed records are read, so a query touches O(log n) pages and the file
+    is never loaded. With fence_stride=k the key of every k-th record is kept
+    in memory and queries bisect it first, leaving only log2(k) probes in
+    the mapped file.
+    """
+    
+    def __init__(self, path, dtype=None, fmt=None, key=None, fence_stride=None):
+        if (dtype is None) == (fmt is None):
+            raise ValueError("MappedSortedFile expects exactly one of dtype or fmt")
+        if dtype is not None:
+            self._dtype = np.dtype(dtype)
+            self.record_size = self._dtype.itemsize
+            self._key_struct, self._key_offset = _key_layout(self._dtype, key)
+            # NumPy reads 'S' fields without their trailing null padding.
+            self._strip_nulls = self._key_struct.format.endswith('s')
+            self._record_struct = None
+        else:
+            self._dtype = None
+            self._record_struct = struct.Struct(fmt)
+            self.record_size = self._record_struct.size
+            self._key_index = 0 if key is None else key
+        
+        size = os.path.getsize(path)
+        if size % self.record_size:
+            raise ValueError("file size is not a multiple of the record size")
+        self._n = size // self.record_size
+        self._map = None
+        if size:
+            with open(path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(self._map, 'madvise') and hasattr(mmap, 'MADV_RANDOM'):
+                # Probes jump around the file, so read-ahead only wastes I/O.
+                self._map.madvise(mmap.MADV_RANDOM)
+        
+        self._stride = fence_stride
+        self._fences = None
+        if fence_stride:
+            if fence_stride < 1:
+                raise ValueError("fence_stride must be positive")
+            self._fences = [self.key_at(i) for i in range(0, self._n, fence_stride)]
+    
+    def __len__(self):
+        return self._n
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        """Unmap the file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+    
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("MappedSortedFile index out of range")
+        offset = index * self.record_size
+        if self._dtype is not None:
+            # Copy so no view keeps the mapping pinned after close().
+            return np.frombuffer(self._map, self._dtype, count=1, offset=offset).copy()[0]
+        return self._record_struct.unpack_from(self._map, offset)
+    
+    def key_at(self, index):
+        """Key of the record at index, read straight from the mapping."""
+        offset = index * self.record_size
+        if self._dtype is not None:
+            key = self._key_struct.unpack_from(self._map, offset + self._key_offset)[0]
+            return key.rstrip(b'\0') if self._strip_nulls else key
+        return self._record_struct.unpack_from(self._map, offset)[self._key_index]
+    
+    def _window(self, target, bisect):
+        """Record range [lo, hi) that the fence index narrows a query to."""
+        if self._fences is None:
+            return 0, self._n
+        j = bisect(self._fences, target)
+        lo = (j - 1) * self._stride + 1 if j else 0
+        hi = min(j * self._stride, self._n)
+        return lo, hi
+    
+    def lower_bound(self, target):
+        """Index of the first record with key >= target (len if there is none)."""
+        lo, hi = self._window(target, bisect_left)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key_at(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def upper_bound(self, target):
+        """Index of the first record with key > target (len if there is none)."""
+        lo, hi = self._window(target, bisect_right)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if target < self.key_at(mid):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+    
+    def find_first_occurrence(self, target):
+        """Index of the first record with key == target, or -1."""
+        i = self.lower_bound(target)
+        if i < self._n and self.key_at(i) == target:
+            return i
+        return -1
+    
+    def binary_search(self, target):
+        """Index of some record with key == target, or -1."""
+        lo, hi = self._window(target, bisect_left)
+        hi = min(hi, self._n - 1)
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            key = self.key_at(mid)
+            if key == target:
+                return mid
+            if key < target:
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        return -1
+    
+    def count_in_range(self, lo, hi):
+        """Number of records with lo <= key < hi."""
+        return max(0, self.lower_bound(hi) - self.lower_bound(lo))
+
+
+def _key_layout(dtype, key):
+    """struct reader and byte offset for the key of a NumPy record dtype."""
+    if key is None:
+        if dtype.fields is not None:
+            raise ValueError("key must name a field of a structured dtype")
+        field, offset = dtype, 0
+    else:
+        if dtype.fields is None or key not in dtype.fields:
+            raise ValueError(f"dtype has no field {key!r}")
+        field, offset = dtype.fields[key][:2]
+    
+    if field.kind == 'S':
+        code = f'{field.itemsize}s'
+    else:
+        code = _STRUCT_CODES.get((field.kind, field.itemsize))
+        if code is None:
+            raise ValueError(f"unsupported key dtype {field}")
+    order = field.byteorder if field.byteorder in '<>' else '='
+    return struct.Struct(order + code), offset
@@ -2,28 +2,120 @@
 Sorting Algorithms Solutions
 """
 
+import heapq
+import os
+import pickle
+import tempfile
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
 
-def bubble_sort(arr):
+import numpy as np
+
+
+def _sort_decorated(sort_inplace, arr, key, reverse):
+    """Sort arr by key with an in-place list sort, returning a new list.
+    
+    Every key is computed exactly once and paired with the element's
+    position, so the pairs never compare two elements directly and equal
+    keys keep their original order even under an unstable sort. For
+    reverse the position is negated and the ascending result reversed,
+    which keeps equal keys in their original order as well.
+    """
+    items = list(arr)
+    keys = items if key is None else [key(x) for x in items]
+    step = -1 if reverse else 1
+    decorated = list(zip(keys, range(0, step * len(items), step)))
+    sort_inplace(decorated)
+    if reverse:
+        decorated.reverse()
+    return [items[step * i] for _, i in decorated]
+
+
+def bubble_sort(arr, key=None, reverse=False):
     """Bubble sort implementation."""
+    if key is not None or reverse:
+        return _sort_decorated(_bubble_sort, arr, key, reverse)
     arr = arr.copy()
+    _bubble_sort(arr)
+    return arr
+
+
+def _bubble_sort(arr):
+    """Bubble sort arr in place."""
     n = len(arr)
     for i in range(n):
         for j in range(0, n - i - 1):
             if arr[j] > arr[j + 1]:
                 arr[j], arr[j + 1] = arr[j + 1], arr[j]
-    return arr
 
 
-def merge_sort(arr):
+def merge_sort(arr, key=None, reverse=False):
     """Merge sort implementation."""
-    if len(arr) <= 1:
-        return arr
+    if key is not None or reverse:
+        return _sort_decorated(_merge_sort_buffered, arr, key, reverse)
+    result = list(arr)
+    _merge_sort_buffered(result)
+    return result
+
+
+def merge_sort_inplace(arr, key=None, reverse=False):
+    """Sort a list in place with bottom-up merge sort."""
+    if key is not None or reverse:
+        arr[:] = _sort_decorated(_merge_sort_buffered, arr, key, reverse)
+    else:
+        _merge_sort_buffered(arr)
+
+
+# Runs shorter than this are insertion-sorted before the merge passes start.
+MERGE_SORT_RUN = 32
+
+
+def _merge_sort_buffered(arr):
+    """Bottom-up merge sort that ping-pongs between arr and one scratch buffer."""
+    n = len(arr)
+    if n <= 1:
+        return
     
-    mid = len(arr) // 2
-    left = merge_sort(arr[:mid])
-    right = merge_sort(arr[mid:])
+    for lo in range(0, n, MERGE_SORT_RUN):
+        _insertion_sort_range(arr, lo, min(lo + MERGE_SORT_RUN, n))
     
-    return merge(left, right)
+    src, dst = arr, [None] * n
+    width = MERGE_SORT_RUN
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            _merge_into(src, dst, lo, mid, hi)
+        src, dst = dst, src
+        width *= 2
+    
+    # An odd number of passes leaves the result in the scratch buffer.
+    if src is not arr:
+        arr[:] = src
+
+
+def _merge_into(src, dst, lo, mid, hi):
+    """Merge src[lo:mid] and src[mid:hi] into dst[lo:hi]."""
+    if mid >= hi or src[mid - 1] <= src[mid]:
+        dst[lo:hi] = src[lo:hi]
+        return
+    
+    i, j, k = lo, mid, lo
+    while i < mid and j < hi:
+        if src[i] <= src[j]:
+            dst[k] = src[i]
+            i += 1
+        else:
+            dst[k] = src[j]
+            j += 1
+        k += 1
+    
+    if i < mid:
+        dst[k:hi] = src[i:mid]
+    else:
+        dst[k:hi] = src[j:hi]
 
 
 def merge(left, right):
@@ -44,22 +136,289 @@ def merge(left, right):
     return result
 
 
-def quick_sort(arr):
+def kway_merge(*iterables, key=None, reverse=False):
+    """Lazily merge any number of sorted iterables with a loser tree.
+    
+    Yields items one at a time, holding only the current head of each
+    input, so the inputs may be generators over files or sockets. Each key
+    is computed once. Equal items come out in the order of the iterables
+    they came from. With reverse the inputs must be sorted descending.
+    """
+    sources = [iter(iterable) for iterable in iterables]
+    k = len(sources)
+    if k == 0:
+        return
+    if k == 1:
+        yield from sources[0]
+        return
+    
+    heads = [None] * k
+    keys = [None] * k
+    live = [True] * k
+    
+    def advance(i):
+        for item in sources[i]:
+            heads[i] = item
+            keys[i] = item if key is None else key(item)
+            return
+        live[i] = False
+        heads[i] = keys[i] = None
+    
+    def beats(a, b):
+        if not live[a]:
+            return False
+        if not live[b]:
+            return True
+        ka, kb = keys[a], keys[b]
+        if reverse:
+            ka, kb = kb, ka
+        return ka < kb or (not kb < ka and a < b)
+    
+    for i in range(k):
+        advance(i)
+    
+    # Node j has children 2j and 2j + 1; leaf i sits at node k + i.
+    losers = [0] * k
+    winners = [0] * k + list(range(k))
+    for j in range(k - 1, 0, -1):
+        a, b = winners[2 * j], winners[2 * j + 1]
+        if beats(a, b):
+            winners[j], losers[j] = a, b
+        else:
+            winners[j], losers[j] = b, a
+    winner = winners[1]
+    
+    while live[winner]:
+        yield heads[winner]
+        advance(winner)
+        node = (k + winner) >> 1
+        while node:
+            if beats(losers[node], winner):
+                losers[node], winner = winner, losers[node]
+            node >>= 1
+
+
+def quick_sort(arr, key=None, reverse=False):
     """Quick sort implementation."""
-    if len(arr) <= 1:
-        return arr
+    if key is not None or reverse:
+        return _sort_decorated(_introsort_list, arr, key, reverse)
+    result = list(arr)
+    _introsort_list(result)
+    return result
+
+
+def introsort(arr, key=None, reverse=False):
+    """Sort a list in place with introsort."""
+    if key is not None or reverse:
+        arr[:] = _sort_decorated(_introsort_list, arr, key, reverse)
+    else:
+        _introsort_list(arr)
+
+
+def _introsort_list(arr):
+    """Introsort a whole list in place."""
+    n = len(arr)
+    if n > 1:
+        _introsort(arr, 0, n, 2 * (n.bit_length() - 1))
+
+
+# Partitions at most this long are finished with insertion sort.
+INTROSORT_CUTOFF = 16
+
+
+def _introsort(arr, lo, hi, depth):
+    """Quicksort arr[lo:hi], switching to heapsort once depth runs out."""
+    while hi - lo > INTROSORT_CUTOFF:
+        if depth == 0:
+            _heapsort_range(arr, lo, hi)
+            return
+        depth -= 1
+        
+        lt, gt = _partition3(arr, lo, hi, _choose_pivot(arr, lo, hi))
+        # Recurse into the smaller side and loop on the larger one,
+        # which bounds the stack at O(log n) frames.
+        if lt - lo < hi - gt:
+            _introsort(arr, lo, lt, depth)
+            lo = gt
+        else:
+            _introsort(arr, gt, hi, depth)
+            hi = lt
+    
+    _insertion_sort_range(arr, lo, hi)
+
+
+def _choose_pivot(arr, lo, hi):
+    """Median of three for short ranges, Tukey's ninther for long ones."""
+    n = hi - lo
+    mid = lo + n // 2
+    if n < 128:
+        return _median3(arr[lo], arr[mid], arr[hi - 1])
+    
+    step = n // 8
+    return _median3(
+        _median3(arr[lo], arr[lo + step], arr[lo + 2 * step]),
+        _median3(arr[mid - step], arr[mid], arr[mid + step]),
+        _median3(arr[hi - 1 - 2 * step], arr[hi - 1 - step], arr[hi - 1]),
+    )
+
+
+def _median3(a, b, c):
+    """Median of three values."""
+    if a < b:
+        if b < c:
+            return b
+        return c if a < c else a
+    if a < c:
+        return a
+    return c if b < c else b
+
+
+def _partition3(arr, lo, hi, pivot):
+    """Dutch national flag partition of arr[lo:hi] around pivot.
     
-    pivot = arr[len(arr) // 2]
-    left = [x for x in arr if x < pivot]
-    middle = [x for x in arr if x == pivot]
-    right = [x for x in arr if x > pivot]
+    Returns (lt, gt) such that arr[lo:lt] < pivot, arr[lt:gt] == pivot
+    and arr[gt:hi] > pivot.
+    """
+    lt, i, gt = lo, lo, hi
+    while i < gt:
+        x = arr[i]
+        if x < pivot:
+            arr[i] = arr[lt]
+            arr[lt] = x
+            lt += 1
+            i += 1
+        elif pivot < x:
+            gt -= 1
+            arr[i] = arr[gt]
+            arr[gt] = x
+        else:
+            i += 1
+    return lt, gt
+
+
+def _heapsort_range(arr, lo, hi):
+    """Heapsort arr[lo:hi] in place."""
+    n = hi - lo
+    for root in range(n // 2 - 1, -1, -1):
+        _sift_down(arr, lo, root, n)
+    for end in range(n - 1, 0, -1):
+        arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+        _sift_down(arr, lo, 0, end)
+
+
+def _sift_down(arr, lo, root, n):
+    """Restore the max-heap property below root in the heap arr[lo:lo + n]."""
+    item = arr[lo + root]
+    child = 2 * root + 1
+    while child < n:
+        if child + 1 < n and arr[lo + child] < arr[lo + child + 1]:
+            child += 1
+        if not item < arr[lo + child]:
+            break
+        arr[lo + root] = arr[lo + child]
+        root = child
+        child = 2 * root + 1
+    arr[lo + root] = item
+
+
+def quickselect(arr, k):
+    """Return the k-th smallest item (0-based), partitioning arr in place.
     
-    return quick_sort(left) + middle + quick_sort(right)
+    Afterwards arr[k] holds that item, everything before it is <= arr[k]
+    and everything after it is >= arr[k] (C++'s nth_element). Like
+    introsort, the quickselect loop falls back to median-of-medians pivots
+    once its depth budget runs out, which guarantees linear time.
+    """
+    n = len(arr)
+    if k < 0:
+        k += n
+    if not 0 <= k < n:
+        raise IndexError("quickselect index out of range")
+    _introselect(arr, 0, n, k)
+    return arr[k]
 
 
-def insertion_sort(arr):
+def partial_sort(arr, k, key=None):
+    """Sort the k smallest items of arr into arr[:k] in place.
+    
+    The order of arr[k:] is unspecified. Runs in O(n + k log k).
+    """
+    if key is not None:
+        arr[:] = _sort_decorated(lambda items: partial_sort(items, k), arr, key, False)
+        return
+    
+    n = len(arr)
+    k = min(k, n)
+    if k <= 0:
+        return
+    if k < n:
+        _introselect(arr, 0, n, k - 1)
+    _introsort(arr, 0, k, 2 * (k.bit_length() - 1))
+
+
+def nsmallest(iterable, n, key=None):
+    """The n smallest items of an iterable, in order (heapq.nsmallest).
+    
+    heapq keeps a bounded heap of n items, so iterable may be a stream.
+    Equal items come out in the order they were seen.
+    """
+    return heapq.nsmallest(n, iterable, key=key)
+
+
+def nlargest(iterable, n, key=None):
+    """The n largest items of an iterable, in order (heapq.nlargest).
+    
+    heapq keeps a bounded heap of n items, so iterable may be a stream.
+    Equal items come out in the order they were seen.
+    """
+    return heapq.nlargest(n, iterable, key=key)
+
+
+def _introselect(arr, lo, hi, k):
+    """Partition arr[lo:hi] in place until arr[k] is in its sorted position."""
+    depth = 2 * (hi - lo).bit_length()
+    while hi - lo > INTROSORT_CUTOFF:
+        if depth == 0:
+            pivot = _median_of_medians(arr, lo, hi)
+        else:
+            depth -= 1
+            pivot = _choose_pivot(arr, lo, hi)
+        
+        lt, gt = _partition3(arr, lo, hi, pivot)
+        if k < lt:
+            hi = lt
+        elif k < gt:
+            return
+        else:
+            lo = gt
+    
+    _insertion_sort_range(arr, lo, hi)
+
+
+def _median_of_medians(arr, lo, hi):
+    """Pivot value guaranteed to split arr[lo:hi] no worse than 30/70."""
+    medians = []
+    for start in range(lo, hi, 5):
+        group = arr[start:min(start + 5, hi)]
+        _insertion_sort_range(group, 0, len(group))
+        medians.append(group[len(group) // 2])
+    
+    middle = len(medians) // 2
+    _introselect(medians, 0, len(medians), middle)
+    return medians[middle]
+
+
+def insertion_sort(arr, key=None, reverse=False):
     """Insertion sort implementation."""
+    if key is not None or reverse:
+        return _sort_decorated(_insertion_sort, arr, key, reverse)
     arr = arr.copy()
+    _insertion_sort(arr)
+    return arr
+
+
+def _insertion_sort(arr):
+    """Insertion sort arr in place."""
     for i in range(1, len(arr)):
         key = arr[i]
         j = i - 1
@@ -67,4 +426,693 @@ def insertion_sort(arr):
             arr[j + 1] = arr[j]
             j -= 1
         arr[j + 1] = key
+
+
+def _insertion_sort_range(arr, lo, hi):
+    """Insertion sort of arr[lo:hi] in place."""
+    for i in range(lo + 1, hi):
+        key = arr[i]
+        j = i - 1
+        while j >= lo and key < arr[j]:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = key
+
+
+def binary_insertion_sort(arr, key=None, reverse=False):
+    """Insertion sort that finds each insertion point by binary search."""
+    if key is not None or reverse:
+        return _sort_decorated(_binary_insertion_sort_list, arr, key, reverse)
+    arr = list(arr)
+    _binary_insertion_sort_list(arr)
     return arr
+
+
+def _binary_insertion_sort_list(arr):
+    """Binary insertion sort a whole list in place."""
+    _binary_insertion_sort(arr, 0, len(arr), 1)
+
+
+def _binary_insertion_sort(arr, lo, hi, start):
+    """Extend the sorted prefix arr[lo:start] to cover arr[lo:hi]."""
+    for i in range(max(start, lo + 1), hi):
+        pivot = arr[i]
+        pos = bisect_right(arr, pivot, lo, i)
+        arr[pos + 1:i + 1] = arr[pos:i]
+        arr[pos] = pivot
+
+
+# Galloping kicks in after one run wins this many comparisons in a row.
+MIN_GALLOP = 7
+
+
+def tim_sort(arr, key=None, reverse=False):
+    """Adaptive hybrid sort that merges the natural runs already in the input."""
+    if key is not None or reverse:
+        return _sort_decorated(_tim_sort, arr, key, reverse)
+    result = list(arr)
+    _tim_sort(result)
+    return result
+
+
+def _tim_sort(arr):
+    """Timsort arr in place."""
+    n = len(arr)
+    if n < 2:
+        return
+    
+    min_run = _min_run_length(n)
+    runs = []  # stack of [start, length]
+    state = [MIN_GALLOP]  # adaptive galloping threshold shared by all merges
+    lo = 0
+    while lo < n:
+        run_len = _count_run(arr, lo, n)
+        if run_len < min_run:
+            forced = min(min_run, n - lo)
+            _binary_insertion_sort(arr, lo, lo + forced, lo + run_len)
+            run_len = forced
+        runs.append([lo, run_len])
+        _merge_collapse(arr, runs, state)
+        lo += run_len
+    
+    while len(runs) > 1:
+        i = len(runs) - 2
+        if i > 0 and runs[i - 1][1] < runs[i + 1][1]:
+            i -= 1
+        _merge_at(arr, runs, i, state)
+
+
+def _min_run_length(n):
+    """Minimum run length so that n / min_run is close to a power of two."""
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+def _count_run(arr, lo, hi):
+    """Length of the run starting at lo, reversing it if strictly descending."""
+    run_hi = lo + 1
+    if run_hi == hi:
+        return 1
+    
+    if arr[run_hi] < arr[lo]:
+        while run_hi < hi and arr[run_hi] < arr[run_hi - 1]:
+            run_hi += 1
+        arr[lo:run_hi] = arr[lo:run_hi][::-1]
+    else:
+        while run_hi < hi and not arr[run_hi] < arr[run_hi - 1]:
+            run_hi += 1
+    
+    return run_hi - lo
+
+
+def _merge_collapse(arr, runs, state):
+    """Merge runs on the stack until the Timsort length invariants hold."""
+    while len(runs) > 1:
+        i = len(runs) - 2
+        if ((i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1])
+                or (i > 1 and runs[i - 2][1] <= runs[i - 1][1] + runs[i][1])):
+            if runs[i - 1][1] < runs[i + 1][1]:
+                i -= 1
+        elif runs[i][1] > runs[i + 1][1]:
+            break
+        _merge_at(arr, runs, i, state)
+
+
+def _merge_at(arr, runs, i, state):
+    """Merge the adjacent runs at stack positions i and i + 1."""
+    base_a, len_a = runs[i]
+    base_b, len_b = runs[i + 1]
+    runs[i][1] = len_a + len_b
+    del runs[i + 1]
+    
+    # Elements of A that are <= B[0] and of B that are >= A[-1] are in place.
+    k = _gallop_right(arr[base_b], arr, base_a, len_a, 0)
+    base_a += k
+    len_a -= k
+    if len_a == 0:
+        return
+    len_b = _gallop_left(arr[base_a + len_a - 1], arr, base_b, len_b, len_b - 1)
+    if len_b == 0:
+        return
+    
+    if len_a <= len_b:
+        _merge_lo(arr, base_a, len_a, base_b, len_b, state)
+    else:
+        _merge_hi(arr, base_a, len_a, base_b, len_b, state)
+
+
+def _gallop_left(key, arr, base, length, hint):
+    """Leftmost k in [0, length] with arr[base + k - 1] < key <= arr[base + k]."""
+    last_ofs, ofs = 0, 1
+    if arr[base + hint] < key:
+        max_ofs = length - hint
+        while ofs < max_ofs and arr[base + hint + ofs] < key:
+            last_ofs, ofs = ofs, (ofs << 1) + 1
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = last_ofs + hint, ofs + hint
+    else:
+        max_ofs = hint + 1
+        while ofs < max_ofs and not arr[base + hint - ofs] < key:
+            last_ofs, ofs = ofs, (ofs << 1) + 1
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = hint - ofs, hint - last_ofs
+    return bisect_left(arr, key, base + last_ofs + 1, base + ofs) - base
+
+
+def _gallop_right(key, arr, base, length, hint):
+    """Rightmost k in [0, length] with arr[base + k - 1] <= key < arr[base + k]."""
+    last_ofs, ofs = 0, 1
+    if key < arr[base + hint]:
+        max_ofs = hint + 1
+        while ofs < max_ofs and key < arr[base + hint - ofs]:
+            last_ofs, ofs = ofs, (ofs << 1) + 1
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = hint - ofs, hint - last_ofs
+    else:
+        max_ofs = length - hint
+        while ofs < max_ofs and not key < arr[base + hint + ofs]:
+            last_ofs, ofs = ofs, (ofs << 1) + 1
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = last_ofs + hint, ofs + hint
+    return bisect_right(arr, key, base + last_ofs + 1, base + ofs) - base
+
+
+def _merge_lo(arr, base_a, len_a, base_b, len_b, state):
+    """Merge left to right, buffering the shorter run A."""
+    tmp = arr[base_a:base_a + len_a]
+    i, j, k = 0, base_b, base_a
+    end_b = base_b + len_b
+    min_gallop = state[0]
+    
+    while i < len_a and j < end_b:
+        # One pair at a time until one side keeps winning.
+        count_a = count_b = 0
+        while i < len_a and j < end_b:
+            if arr[j] < tmp[i]:
+                arr[k] = arr[j]
+                j += 1
+                count_b += 1
+                count_a = 0
+            else:
+                arr[k] = tmp[i]
+                i += 1
+                count_a += 1
+                count_b = 0
+            k += 1
+            if count_a >= min_gallop or count_b >= min_gallop:
+                break
+        
+        # Galloping: copy whole blocks while the streaks stay long.
+        min_gallop += 1
+        while i < len_a and j < end_b:
+            min_gallop -= min_gallop > 1
+            count_a = _gallop_right(arr[j], tmp, i, len_a - i, 0)
+            arr[k:k + count_a] = tmp[i:i + count_a]
+            k += count_a
+            i += count_a
+            if i == len_a:
+                break
+            arr[k] = arr[j]
+            k += 1
+            j += 1
+            if j == end_b:
+                break
+            
+            count_b = _gallop_left(tmp[i], arr, j, end_b - j, 0)
+            arr[k:k + count_b] = arr[j:j + count_b]
+            k += count_b
+            j += count_b
+            if j == end_b:
+                break
+            arr[k] = tmp[i]
+            k += 1
+            i += 1
+            
+            if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                min_gallop += 1
+                break
+    
+    # Whatever is left of B is already in its final place.
+    arr[k:k + len_a - i] = tmp[i:]
+    state[0] = max(1, min_gallop)
+
+
+def _merge_hi(arr, base_a, len_a, base_b, len_b, state):
+    """Merge right to left, buffering the shorter run B."""
+    tmp = arr[base_b:base_b + len_b]
+    i, j, k = base_a + len_a - 1, len_b - 1, base_b + len_b - 1
+    min_gallop = state[0]
+    
+    while i >= base_a and j >= 0:
+        count_a = count_b = 0
+        while i >= base_a and j >= 0:
+            if tmp[j] < arr[i]:
+                arr[k] = arr[i]
+                i -= 1
+                count_a += 1
+                count_b = 0
+            else:
+                arr[k] = tmp[j]
+                j -= 1
+                count_b += 1
+                count_a = 0
+            k -= 1
+            if count_a >= min_gallop or count_b >= min_gallop:
+                break
+        
+        min_gallop += 1
+        while i >= base_a and j >= 0:
+            min_gallop -= min_gallop > 1
+            len_left = i + 1 - base_a
+            count_a = len_left - _gallop_right(tmp[j], arr, base_a, len_left, len_left - 1)
+            arr[k - count_a + 1:k + 1] = arr[i - count_a + 1:i + 1]
+            k -= count_a
+            i -= count_a
+            if i < base_a:
+                break
+            arr[k] = tmp[j]
+            k -= 1
+            j -= 1
+            if j < 0:
+                break
+            
+            count_b = j + 1 - _gallop_left(arr[i], tmp, 0, j + 1, j)
+            arr[k - count_b + 1:k + 1] = tmp[j - count_b + 1:j + 1]
+            k -= count_b
+            j -= count_b
+            if j < 0:
+                break
+            arr[k] = arr[i]
+            k -= 1
+            i -= 1
+            
+            if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                min_gallop += 1
+                break
+    
+    # Whatever is left of A is already in its final place.
+    arr[base_a:base_a + j + 1] = tmp[:j + 1]
+    state[0] = max(1, min_gallop)
+
+
+# Width of one radix pass; 16-bit digits go through NumPy's counting path.
+RADIX_BITS = 16
+# radix_argsort falls back to np.argsort past this many passes, where
+# NumPy's stable sort catches up (64-bit floats, full-range int64).
+RADIX_MAX_PASSES = 3
+# From this size on, counting sort beats np.sort on one-byte keys.
+COUNTING_MIN_SIZE = 1 << 12
+# counting_sort hands keys spanning more than this many counts per element
+# (plus 256, so one-byte keys always qualify) over to np.sort.
+COUNTING_MAX_SPAN_RATIO = 4
+
+
+def sort_array(arr):
+    """Sort a 1-D NumPy array, with counting sort for one-byte keys.
+    
+    np.sort's default kind is the fastest option for every other dtype
+    (see benchmarks/bench_sorting.py), and since only values are returned
+    its lack of stability is invisible.
+    """
+    arr = np.asarray(arr)
+    if arr.ndim != 1:
+        raise ValueError("sort_array expects a 1-D array")
+    if arr.dtype.kind in 'biu' and arr.dtype.itemsize == 1 and arr.size >= COUNTING_MIN_SIZE:
+        return counting_sort(arr)
+    return np.sort(arr)
+
+
+def counting_sort(arr):
+    """Counting sort for integer arrays with a small key range (np.sort otherwise)."""
+    arr = np.asarray(arr)
+    if arr.dtype.kind not in 'biu':
+        raise ValueError("counting_sort expects an integer or boolean array")
+    if arr.size == 0:
+        return arr.copy()
+    
+    keys = _unsigned_keys(arr)
+    base = keys.min()
+    if int(keys.max() - base) > COUNTING_MAX_SPAN_RATIO * arr.size + 256:
+        return np.sort(arr)
+    counts = np.bincount((keys - base).astype(np.intp))
+    sorted_keys = np.repeat(np.arange(counts.size, dtype=keys.dtype) + base, counts)
+    return _from_unsigned_keys(sorted_keys, arr.dtype)
+
+
+def radix_sort(arr):
+    """LSD radix sort for integer, boolean and floating point arrays."""
+    arr = np.asarray(arr)
+    return arr[radix_argsort(arr)]
+
+
+def radix_argsort(arr):
+    """Stable permutation that sorts arr, computed with LSD radix passes."""
+    arr = np.asarray(arr)
+    if arr.ndim != 1 or arr.dtype.kind not in 'biuf':
+        raise ValueError("radix_argsort expects a 1-D numeric array")
+    if arr.size == 0:
+        return np.arange(0)
+    
+    if arr.dtype.itemsize <= 2 or (arr.dtype.kind == 'f' and arr.dtype.itemsize > 4):
+        # NumPy already radix sorts 8- and 16-bit keys, and float64 keys
+        # nearly always span more than RADIX_MAX_PASSES digits.
+        return np.argsort(arr, kind='stable')
+    
+    keys = _unsigned_keys(arr)
+    keys = keys - keys.min()
+    span = int(keys.max())
+    if span.bit_length() > RADIX_MAX_PASSES * RADIX_BITS:
+        return np.argsort(arr, kind='stable')
+    return _radix_order(keys, span)
+
+
+def _unsigned_keys(arr):
+    """Unsigned integers of the same width that sort in the same order as arr."""
+    kind = arr.dtype.kind
+    if kind == 'b':
+        return arr.view(np.uint8)
+    if kind == 'u':
+        return arr
+    
+    utype = np.dtype(f'u{arr.dtype.itemsize}')
+    bits = arr.view(utype)
+    sign = utype.type(1 << (8 * arr.dtype.itemsize - 1))
+    if kind == 'i':
+        return bits ^ sign
+    # Negative floats sort reversed, so flip all their bits; positives get the sign bit.
+    return np.where(bits & sign, ~bits, bits | sign)
+
+
+def _from_unsigned_keys(keys, dtype):
+    """Inverse of _unsigned_keys for integer and boolean dtypes."""
+    if dtype.kind == 'i':
+        return (keys ^ keys.dtype.type(1 << (8 * dtype.itemsize - 1))).view(dtype)
+    return keys.view(dtype)
+
+
+def _radix_order(keys, span):
+    """LSD radix argsort of non-negative keys no larger than span."""
+    order = np.arange(keys.size)
+    shift = 0
+    while span >> shift:
+        digits = (keys >> keys.dtype.type(shift)).astype(np.uint16)
+        order = order[np.argsort(digits[order], kind='stable')]
+        shift += RADIX_BITS
+    return order
+
+
+# Items per pickled batch in a spilled run, and per block read back from a run.
+EXTERNAL_SORT_BLOCK = 4096
+
+
+def external_sort(source, chunk_size=1_000_000, dtype=None, tmp_dir=None,
+                  key=None, reverse=False):
+    """Sort data larger than memory, yielding the items in ascending order.
+    
+    source is an iterable of items or a file path. Without dtype a path is
+    read as text lines, chunks are sorted with tim_sort and spilled as
+    pickled runs. With a NumPy dtype the items are fixed-width records: a
+    path is read as a raw binary file of that dtype, chunks are sorted with
+    sort_array, spilled as raw binary and memory-mapped back for merging.
+    At most chunk_size items are held in memory while spilling, and one
+    block per run while merging. key is only supported without dtype.
+    """
+    if key is not None and dtype is not None:
+        raise ValueError("external_sort does not support key with fixed-width records")
+    
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as workdir:
+        if dtype is None:
+            runs = _spill_pickled_runs(_read_items(source), chunk_size, workdir, key, reverse)
+            streams = [_read_pickled_run(path) for path in runs]
+        else:
+            dtype = np.dtype(dtype)
+            runs = _spill_binary_runs(_read_records(source, dtype, chunk_size), workdir, reverse)
+            streams = [_read_binary_run(path, dtype) for path in runs]
+        
+        yield from kway_merge(*streams, key=key, reverse=reverse)
+
+
+def _read_items(source):
+    """Items of an iterable, or the lines of a text file without newlines."""
+    if not isinstance(source, (str, os.PathLike)):
+        yield from source
+        return
+    with open(source) as f:
+        for line in f:
+            yield line.rstrip('\r\n')
+
+
+def _read_records(source, dtype, chunk_size):
+    """Arrays of at most chunk_size records from an iterable or binary file."""
+    if isinstance(source, (str, os.PathLike)):
+        if os.path.getsize(source) == 0:
+            return
+        records = np.memmap(source, dtype=dtype, mode='r')
+        for start in range(0, len(records), chunk_size):
+            yield np.array(records[start:start + chunk_size])
+        return
+    
+    items = iter(source)
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+        yield np.array(chunk, dtype=dtype)
+
+
+def _spill_pickled_runs(items, chunk_size, workdir, key=None, reverse=False):
+    """Sort chunks of items and pickle each one to its own run file."""
+    runs = []
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return runs
+        chunk = tim_sort(chunk, key=key, reverse=reverse)
+        
+        path = os.path.join(workdir, f'run{len(runs)}.pickle')
+        with open(path, 'wb') as f:
+            for start in range(0, len(chunk), EXTERNAL_SORT_BLOCK):
+                pickle.dump(chunk[start:start + EXTERNAL_SORT_BLOCK], f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        runs.append(path)
+
+
+def _read_pickled_run(path):
+    """Stream the items of a pickled run one batch at a time."""
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            yield from batch
+
+
+def _spill_binary_runs(chunks, workdir, reverse=False):
+    """Sort each record array and write it out as a raw binary run."""
+    runs = []
+    for chunk in chunks:
+        path = os.path.join(workdir, f'run{len(runs)}.bin')
+        chunk = sort_array(chunk)
+        (chunk[::-1] if reverse else chunk).tofile(path)
+        runs.append(path)
+    return runs
+
+
+def _read_binary_run(path, dtype):
+    """Stream the records of a binary run through a read-only memory map."""
+    records = np.memmap(path, dtype=dtype, mode='r')
+    for start in range(0, len(records), EXTERNAL_SORT_BLOCK):
+        yield from records[start:start + EXTERNAL_SORT_BLOCK].tolist()
+
+
+# sort_segments pads segments into a matrix while that stays within this
+# multiple of the number of values.
+SEGMENT_PADDING_LIMIT = 4
+
+
+def sort_segments(values, offsets):
+    """Sort every segment values[offsets[i]:offsets[i + 1]] in one vectorized pass.
+    
+    values and offsets describe a ragged collection (offsets starts at 0,
+    ends at len(values) and never decreases). The result is a new values
+    array that uses the same offsets.
+    """
+    values, offsets = np.asarray(values), np.asarray(offsets)
+    if values.ndim != 1 or offsets.ndim != 1 or offsets.size == 0:
+        raise ValueError("sort_segments expects 1-D values and offsets")
+    lengths = np.diff(offsets)
+    if offsets[0] != 0 or offsets[-1] != values.size or (lengths < 0).any():
+        raise ValueError("offsets must run from 0 to len(values) without decreasing")
+    
+    if values.size == 0:
+        return values.copy()
+    
+    kind = values.dtype.kind
+    if kind in 'biuf' and lengths.max() * lengths.size <= SEGMENT_PADDING_LIMIT * values.size:
+        # Scatter into a padded matrix whose fill value sorts last, sort the
+        # rows and read the valid entries back in row-major order.
+        valid = np.arange(lengths.max()) < lengths[:, None]
+        padded = np.full(valid.shape, _sorts_last(values.dtype), dtype=values.dtype)
+        padded[valid] = values
+        padded.sort(axis=1)
+        return padded[valid]
+    
+    segment_ids = np.repeat(np.arange(lengths.size), lengths)
+    if kind in 'iu':
+        # Pack (segment, value) into one unsigned key when it fits in 64 bits.
+        unsigned = _unsigned_keys(values)
+        base = unsigned.min()
+        span = int(unsigned.max()) - int(base) + 1
+        if (lengths.size - 1).bit_length() + span.bit_length() <= 64:
+            keys = segment_ids.astype(np.uint64) * np.uint64(span)
+            keys += (unsigned - base).astype(np.uint64)
+            keys.sort()
+            unsigned = (keys % np.uint64(span)).astype(unsigned.dtype) + base
+            return _from_unsigned_keys(unsigned, values.dtype)
+    
+    return values[np.lexsort((values, segment_ids))]
+
+
+def sort_rows(rows, lengths=None):
+    """Sort every row of a 2-D array in one vectorized pass.
+    
+    With lengths only the first lengths[i] entries of row i are sorted and
+    the padding after them is left as it was.
+    """
+    rows = np.asarray(rows)
+    if rows.ndim != 2:
+        raise ValueError("sort_rows expects a 2-D array")
+    if lengths is None:
+        return np.sort(rows, axis=1, kind='stable')
+    
+    if rows.size == 0:
+        return rows.copy()
+    
+    padding = np.arange(rows.shape[1]) >= np.asarray(lengths)[:, None]
+    if rows.dtype.kind in 'biuf':
+        result = rows.copy()
+        result[padding] = _sorts_last(rows.dtype)
+        result.sort(axis=1)
+        result[padding] = rows[padding]
+        return result
+    
+    flat = rows.ravel()
+    row_ids = np.repeat(np.arange(rows.shape[0]), rows.shape[1])
+    padding = padding.ravel()
+    # Padding sorts after the valid entries and, with one shared value, keeps its order.
+    order = np.lexsort((np.where(padding, flat[0], flat), padding, row_ids))
+    return flat[order].reshape(rows.shape)
+
+
+def _sorts_last(dtype):
+    """A fill value that no value of dtype sorts after."""
+    if dtype.kind == 'f':
+        return np.nan
+    if dtype.kind == 'b':
+        return True
+    return np.iinfo(dtype).max
+
+
+# Arrays smaller than this are not worth the process start-up cost.
+PARALLEL_MIN_SIZE = 1 << 16
+
+
+def parallel_sort(arr, workers=None):
+    """Sort a 1-D numeric array on several cores through shared memory.
+    
+    Each worker sorts one slice of a shared buffer in place with ndarray.sort.
+    The sorted slices are then merged pairwise; every merge is split into
+    equal output segments along its merge path so that all workers stay
+    busy until the final merge. Data is never pickled between processes.
+    """
+    arr = np.asarray(arr)
+    if arr.ndim != 1 or arr.dtype.kind not in 'biuf':
+        raise ValueError("parallel_sort expects a 1-D numeric array")
+    
+    workers = workers or os.cpu_count() or 1
+    n = arr.size
+    if workers == 1 or n < PARALLEL_MIN_SIZE:
+        return sort_array(arr)
+    
+    buffers = [shared_memory.SharedMemory(create=True, size=arr.nbytes) for _ in range(2)]
+    try:
+        np.ndarray(n, arr.dtype, buffer=buffers[0].buf)[:] = arr
+        src, dst = buffers[0].name, buffers[1].name
+        runs = [n * i // workers for i in range(workers + 1)]
+        
+        with ProcessPoolExecutor(workers) as pool:
+            list(pool.map(_sort_shared_slice,
+                          [(src, n, arr.dtype, lo, hi) for lo, hi in zip(runs, runs[1:])]))
+            
+            while len(runs) > 2:
+                tasks = []
+                merged = [0]
+                for k in range(0, len(runs) - 1, 2):
+                    lo, mid = runs[k], runs[k + 1]
+                    hi = runs[k + 2] if k + 2 < len(runs) else mid
+                    pieces = max(1, round(workers * (hi - lo) / n))
+                    for p in range(pieces):
+                        tasks.append((src, dst, n, arr.dtype, lo, mid, hi,
+                                      (hi - lo) * p // pieces, (hi - lo) * (p + 1) // pieces))
+                    merged.append(hi)
+                list(pool.map(_merge_shared_segment, tasks))
+                src, dst = dst, src
+                runs = merged
+        
+        result = buffers[0] if buffers[0].name == src else buffers[1]
+        return np.ndarray(n, arr.dtype, buffer=result.buf).copy()
+    finally:
+        for shm in buffers:
+            shm.close()
+            shm.unlink()
+
+
+def _sort_shared_slice(task):
+    """Worker: sort one slice of a shared array in place."""
+    name, n, dtype, lo, hi = task
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        data = np.ndarray(n, dtype, buffer=shm.buf)
+        data[lo:hi].sort()
+        del data
+    finally:
+        shm.close()
+
+
+def _merge_shared_segment(task):
+    """Worker: write output positions [d0, d1) of merging src[lo:mid] and src[mid:hi]."""
+    src_name, dst_name, n, dtype, lo, mid, hi, d0, d1 = task
+    src_shm = shared_memory.SharedMemory(name=src_name)
+    dst_shm = shared_memory.SharedMemory(name=dst_name)
+    try:
+        src = np.ndarray(n, dtype, buffer=src_shm.buf)
+        dst = np.ndarray(n, dtype, buffer=dst_shm.buf)
+        left, right = src[lo:mid], src[mid:hi]
+        i0, i1 = _merge_path_split(left, right, d0), _merge_path_split(left, right, d1)
+        a, b = left[i0:i1], right[d0 - i0:d1 - i1]
+        
+        out = dst[lo + d0:lo + d1]
+        # Ties go to the left run first, which keeps the merge stable.
+        out[np.arange(a.size) + np.searchsorted(b, a, side='left')] = a
+        out[np.arange(b.size) + np.searchsorted(a, b, side='right')] = b
+        del src, dst, left, right, a, b, out
+    finally:
+        src_shm.close()
+        dst_shm.close()
+
+
+def _merge_path_split(left, right, diagonal):
+    """Number of elements of left among the first diagonal outputs of their merge."""
+    lo, hi = max(0, diagonal - len(right)), min(diagonal, len(left))
+    while lo < hi:
+        i = (lo + hi) // 2
+        if left[i] <= right[diagonal - i - 1]:
+            lo = i + 1
+        else:
+            hi = i
+    return lo
@@ -85,3 +85,61 @@ def nth_fibonacci_modulo(n, mod):
         a, b = b, (a + b) % mod
     
     return b
+
+
+def binomial(n, k):
+    """Calculate n choose k without computing any factorial.
+    
+    For small k the multiplicative formula is cheapest. Otherwise each
+    prime p <= n appears in the result with Legendre's exponent
+    e(n) - e(k) - e(n - k), and the prime powers are multiplied together
+    by binary splitting.
+    """
+    if k < 0 or k > n:
+        return 0
+    k = min(k, n - k)
+    # The multiplicative loop costs about k**2, the sieve about n (measured).
+    if k * k <= 100 * n:
+        result = 1
+        for i in range(1, k + 1):
+            result = result * (n - k + i) // i
+        return result
+    return _factorial_quotient(n, [k, n - k])
+
+
+def multinomial(counts):
+    """Calculate (sum of counts)! / (product of count!) via prime exponents."""
+    if any(c < 0 for c in counts):
+        raise ValueError("multinomial expects non-negative counts")
+    return _factorial_quotient(sum(counts), counts)
+
+
+def _factorial_quotient(n, parts):
+    """n! / prod(part!) for parts summing to n, built from prime powers."""
+    parts = [c for c in parts if c > 1]
+    powers = []
+    for p in sieve_of_eratosthenes(n):
+        exponent = _legendre(n, p) - sum(_legendre(c, p) for c in parts)
+        if exponent:
+            powers.append(p ** exponent)
+    return _product(powers, 0, len(powers))
+
+
+def _legendre(n, p):
+    """Exponent of the prime p in n!."""
+    exponent = 0
+    while n:
+        n //= p
+        exponent += n
+    return exponent
+
+
+def _product(values, lo, hi):
+    """Product of values[lo:hi] by binary splitting."""
+    if hi - lo <= 16:
+        result = 1
+        for i in range(lo, hi):
+            result *= values[i]
+        return result
+    mid = (lo + hi) // 2
+    return _product(values, lo, mid) * _product(values, mid, hi)
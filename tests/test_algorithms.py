@@ -2,14 +2,18 @@
 Tests for algorithm solutions
 """
 
+import itertools
 import pytest
+import random
+import struct
 import sys
+import numpy as np
 from pathlib import Path
 
 # Add solutions directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'solutions'))
 
-from algorithms import sorting, searching, recursion, dynamic_programming
+from algorithms import sorting, searching, recursion, dynamic_programming, memoization
 
 
 class TestSorting:
@@ -27,15 +31,222 @@ class TestSorting:
         assert sorting.merge_sort([1]) == [1]
         assert sorting.merge_sort([]) == []
     
+    def test_merge_sort_large_and_stable(self):
+        rng = random.Random(1)
+        data = [rng.randint(0, 50) for _ in range(1000)]
+        assert sorting.merge_sort(data) == sorted(data)
+        # 1 and 1.0 compare equal, so their original order must survive
+        mixed = [1.0, 0, 1, 2, 1.0, 1] * 20
+        assert [type(x) for x in sorting.merge_sort(mixed)] == [type(x) for x in sorted(mixed)]
+    
+    def test_merge_sort_inplace(self):
+        rng = random.Random(2)
+        data = [rng.random() for _ in range(777)]
+        expected = sorted(data)
+        assert sorting.merge_sort_inplace(data) is None
+        assert data == expected
+    
+    def test_binary_insertion_sort(self):
+        assert sorting.binary_insertion_sort([64, 34, 25, 12, 22, 11, 90]) == \
+            [11, 12, 22, 25, 34, 64, 90]
+        assert sorting.binary_insertion_sort([]) == []
+    
+    def test_tim_sort(self):
+        rng = random.Random(3)
+        runs = []
+        for _ in range(40):
+            run = sorted(rng.randint(0, 100) for _ in range(rng.randint(1, 200)))
+            runs.extend(run if rng.random() < 0.5 else run[::-1])
+        for data in (runs, list(range(500)), list(range(500, 0, -1)), [3, 1, 2], []):
+            assert sorting.tim_sort(data) == sorted(data)
+        mixed = [1.0, 0, 1, 2, 1.0, 1] * 30
+        assert [type(x) for x in sorting.tim_sort(mixed)] == [type(x) for x in sorted(mixed)]
+    
+    def test_kway_merge(self):
+        rng = random.Random(13)
+        shards = [sorted((rng.randint(0, 20), shard) for _ in range(rng.randint(0, 40)))
+                  for shard in range(7)]
+        merged = list(sorting.kway_merge(*(iter(s) for s in shards), key=lambda r: r[0]))
+        assert merged == sorted((r for s in shards for r in s), key=lambda r: r[0])
+        assert list(sorting.kway_merge([5, 3, 1], [4, 2], reverse=True)) == [5, 4, 3, 2, 1]
+        assert list(sorting.kway_merge()) == []
+        assert list(sorting.kway_merge([], [1], [])) == [1]
+        evens, odds = itertools.count(0, 2), itertools.count(1, 2)
+        assert list(itertools.islice(sorting.kway_merge(evens, odds), 5)) == [0, 1, 2, 3, 4]
+    
     def test_quick_sort(self):
         assert sorting.quick_sort([64, 34, 25, 12, 22, 11, 90]) == [11, 12, 22, 25, 34, 64, 90]
         assert sorting.quick_sort([5, 2, 8, 1, 9]) == [1, 2, 5, 8, 9]
         assert sorting.quick_sort([1]) == [1]
         assert sorting.quick_sort([]) == []
     
+    def test_quick_sort_adversarial_inputs(self):
+        data = [1, 2, 3] * 5000
+        assert sorting.quick_sort(data) == sorted(data)
+        organ_pipe = list(range(3000)) + list(range(3000, 0, -1))
+        assert sorting.quick_sort(organ_pipe) == sorted(organ_pipe)
+        assert sorting.quick_sort([7] * 20000) == [7] * 20000
+        assert data[:3] == [1, 2, 3]  # input left untouched
+    
+    def test_introsort(self):
+        rng = random.Random(4)
+        data = [rng.randint(-1000, 1000) for _ in range(2000)]
+        expected = sorted(data)
+        assert sorting.introsort(data) is None
+        assert data == expected
+    
+    def test_quickselect(self):
+        rng = random.Random(11)
+        data = [rng.randint(0, 100) for _ in range(1000)]
+        expected = sorted(data)
+        for k in (0, 1, 500, 999, -1):
+            arr = list(data)
+            assert sorting.quickselect(arr, k) == expected[k]
+            assert all(x <= arr[k] for x in arr[:k])
+            assert sorted(arr) == expected
+        with pytest.raises(IndexError):
+            sorting.quickselect([1, 2], 2)
+    
+    def test_partial_sort(self):
+        rng = random.Random(12)
+        data = [rng.random() for _ in range(500)]
+        arr = list(data)
+        sorting.partial_sort(arr, 20)
+        assert arr[:20] == sorted(data)[:20]
+        assert sorted(arr) == sorted(data)
+        words = ["pear", "fig", "apple", "kiwi"]
+        sorting.partial_sort(words, 2, key=len)
+        assert words[:2] == ["fig", "pear"]
+    
+    def test_nsmallest_and_nlargest(self):
+        records = [('a', 3), ('b', 1), ('c', 3), ('d', 2), ('e', 1)]
+        
+        def rank(record):
+            return record[1]
+        
+        assert sorting.nsmallest(iter(records), 3, key=rank) == [('b', 1), ('e', 1), ('d', 2)]
+        assert sorting.nlargest(iter(records), 2, key=rank) == [('a', 3), ('c', 3)]
+        assert sorting.nsmallest(range(10**5), 3) == [0, 1, 2]
+        assert sorting.nlargest([5, 1], 10) == [5, 1]
+        assert sorting.nsmallest([5, 1], 0) == []
+    
     def test_insertion_sort(self):
         assert sorting.insertion_sort([64, 34, 25, 12, 22, 11, 90]) == [11, 12, 22, 25, 34, 64, 90]
         assert sorting.insertion_sort([5, 2, 8, 1, 9]) == [1, 2, 5, 8, 9]
+    
+    def test_key_and_reverse(self):
+        records = [('b', 2), ('a', 1), ('c', 2), ('d', 1), ('e', 3), ('f', 2)]
+        calls = []
+        
+        def by_rank(record):
+            calls.append(record)
+            return record[1]
+        
+        ascending = sorted(records, key=lambda r: r[1])
+        descending = sorted(records, key=lambda r: r[1], reverse=True)
+        for sort in (sorting.bubble_sort, sorting.merge_sort, sorting.quick_sort,
+                     sorting.insertion_sort, sorting.binary_insertion_sort, sorting.tim_sort):
+            calls.clear()
+            assert sort(records, key=by_rank) == ascending
+            assert len(calls) == len(records)  # one key computation per element
+            assert sort(records, key=by_rank, reverse=True) == descending
+            assert sort([3, 1, 2], reverse=True) == [3, 2, 1]
+        
+        for sort in (sorting.merge_sort_inplace, sorting.introsort):
+            data = list(records)
+            sort(data, key=by_rank, reverse=True)
+            assert data == descending
+    
+    def test_external_sort_key_and_reverse(self):
+        words = ["pear", "fig", "apple", "kiwi", "banana", "plum", "date"] * 50
+        result = list(sorting.external_sort(words, chunk_size=60, key=len, reverse=True))
+        assert result == sorted(words, key=len, reverse=True)
+        result = list(sorting.external_sort([5, 1, 4, 2, 3], chunk_size=2, dtype=np.int64,
+                                            reverse=True))
+        assert result == [5, 4, 3, 2, 1]
+    
+    def test_counting_sort(self):
+        arr = np.array([3, -2, 7, 3, 0, -2, 5], dtype=np.int8)
+        result = sorting.counting_sort(arr)
+        assert result.dtype == np.int8
+        assert result.tolist() == [-2, -2, 0, 3, 3, 5, 7]
+        assert sorting.counting_sort(np.array([True, False, True])).tolist() == [False, True, True]
+        wide = np.array([2**62, -2**62, 0, 2**40, -1], dtype=np.int64)
+        assert sorting.counting_sort(wide).tolist() == sorted(wide.tolist())
+    
+    def test_radix_sort(self):
+        rng = np.random.default_rng(5)
+        ints = rng.integers(-2**62, 2**62, 5000)
+        floats = rng.standard_normal(5000) * 1e9
+        ids = rng.integers(0, 2**40, 5000, dtype=np.uint64)
+        for arr in (ints, floats, ids):
+            assert np.array_equal(sorting.radix_sort(arr), np.sort(arr))
+        keys = rng.integers(0, 10, 1000)
+        assert np.array_equal(sorting.radix_argsort(keys), np.argsort(keys, kind='stable'))
+    
+    def test_sort_array(self):
+        rng = np.random.default_rng(6)
+        for arr in (rng.integers(-128, 128, 10000, dtype=np.int8),  # counting sort
+                    rng.integers(0, 2, 10000).astype(bool),  # counting sort
+                    rng.integers(0, 100, 10000),
+                    rng.standard_normal(10000),
+                    np.array([3, 1, 2])):
+            result = sorting.sort_array(arr)
+            assert result.dtype == arr.dtype
+            assert np.array_equal(result, np.sort(arr))
+        with pytest.raises(ValueError):
+            sorting.sort_array(np.zeros((2, 2)))
+    
+    def test_external_sort_iterable(self):
+        rng = random.Random(7)
+        data = [rng.randint(0, 1000) for _ in range(2500)]
+        assert list(sorting.external_sort(iter(data), chunk_size=300)) == sorted(data)
+        assert list(sorting.external_sort([], chunk_size=10)) == []
+    
+    def test_external_sort_text_file(self, tmp_path):
+        lines = [f"line-{i * 7919 % 1000:04d}" for i in range(1000)]
+        path = tmp_path / 'log.txt'
+        path.write_text("\n".join(lines) + "\n")
+        assert list(sorting.external_sort(path, chunk_size=128)) == sorted(lines)
+    
+    def test_external_sort_binary_records(self, tmp_path):
+        data = np.random.default_rng(8).integers(-10**9, 10**9, 5000)
+        path = tmp_path / 'ids.bin'
+        data.astype(np.int64).tofile(path)
+        result = list(sorting.external_sort(path, chunk_size=700, dtype=np.int64))
+        assert result == sorted(data.tolist())
+        records = [(3, 1.5), (1, 2.5), (2, 0.5), (1, 0.5)]
+        dtype = np.dtype([('id', np.int32), ('score', np.float64)])
+        assert list(sorting.external_sort(records, chunk_size=2, dtype=dtype)) == sorted(records)
+    
+    def test_sort_segments(self):
+        rng = np.random.default_rng(10)
+        lengths = rng.integers(0, 50, 200)
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        values = rng.integers(0, 1000, offsets[-1])
+        result = sorting.sort_segments(values, offsets)
+        for lo, hi in zip(offsets, offsets[1:]):
+            assert result[lo:hi].tolist() == sorted(values[lo:hi].tolist())
+        with pytest.raises(ValueError):
+            sorting.sort_segments([3, 1, 2], [0, 2])
+    
+    def test_sort_rows(self):
+        rows = np.array([[5, 3, 9, -1], [2, 8, 1, 0], [7, -1, -1, -1]])
+        assert sorting.sort_rows(rows).tolist() == [[-1, 3, 5, 9], [0, 1, 2, 8], [-1, -1, -1, 7]]
+        padded = sorting.sort_rows(rows, lengths=[3, 4, 1])
+        assert padded.tolist() == [[3, 5, 9, -1], [0, 1, 2, 8], [7, -1, -1, -1]]
+        words = np.array([['b', 'a', 'z'], ['d', 'c', 'y']], dtype=object)
+        expected = [['a', 'b', 'z'], ['d', 'c', 'y']]
+        assert sorting.sort_rows(words, lengths=[2, 1]).tolist() == expected
+    
+    def test_parallel_sort(self):
+        rng = np.random.default_rng(9)
+        for arr in (rng.integers(0, 2**32, sorting.PARALLEL_MIN_SIZE + 1001),
+                    rng.standard_normal(sorting.PARALLEL_MIN_SIZE * 2)):
+            for workers in (1, 3):
+                assert np.array_equal(sorting.parallel_sort(arr, workers=workers), np.sort(arr))
+        with pytest.raises(ValueError):
+            sorting.parallel_sort(np.array(['b', 'a']))
 
 
 class TestSearching:
@@ -58,6 +269,235 @@ class TestSearching:
     def test_find_first_occurrence(self):
         assert searching.find_first_occurrence([1, 2, 2, 2, 3, 4, 5], 2) == 1
         assert searching.find_first_occurrence([1, 1, 1, 1], 1) == 0
+    
+    def test_binary_search_batch(self):
+        arr = [1, 2, 2, 2, 3, 5, 8, 8]
+        targets = [2, 8, 0, 4, 9, 1, 3]
+        first = searching.binary_search_batch(arr, targets, mode="first")
+        assert first.tolist() == [1, 6, -1, -1, -1, 0, 4]
+        last = searching.binary_search_batch(arr, targets, mode="last")
+        assert last.tolist() == [3, 7, -1, -1, -1, 0, 4]
+        found = searching.binary_search_batch(arr, targets)
+        assert [arr[i] if i >= 0 else None for i in found] == [2, 8, None, None, None, 1, 3]
+        assert searching.binary_search_batch([], [1, 2]).tolist() == [-1, -1]
+        with pytest.raises(ValueError):
+            searching.binary_search_batch(arr, targets, mode="middle")
+    
+    def test_sorted_array(self):
+        rng = random.Random(14)
+        for typecode in (None, 'q'):
+            sa = searching.SortedArray([5, 1, 3], typecode=typecode, load=4)
+            model = [1, 3, 5]
+            for _ in range(500):
+                value = rng.randint(0, 40)
+                if rng.random() < 0.6:
+                    sa.add(value)
+                    model.append(value)
+                    model.sort()
+                elif value in model:
+                    sa.remove(value)
+                    model.remove(value)
+            assert list(sa) == model and len(sa) == len(model)
+            assert sa.bisect_left(20) == model.index(min(x for x in model if x >= 20))
+            assert sa.count(model[0]) == model.count(model[0])
+            assert sa.index(model[-1]) == model.index(model[-1])
+            assert sa[3] == model[3] and sa[2:9] == model[2:9]
+            assert sa.irange(10, 20) == [x for x in model if 10 <= x <= 20]
+        with pytest.raises(ValueError):
+            searching.SortedArray([1, 2]).remove(3)
+        with pytest.raises(ValueError):
+            searching.SortedArray([1, 2]).index(3)
+    
+    def test_binary_search_iterative(self):
+        arr = [1, 2, 4, 5, 7, 9]
+        for target in range(11):
+            assert searching.binary_search_iterative(arr, target) == \
+                searching.binary_search_recursive(arr, target)
+        assert searching.binary_search_iterative(list(range(10**6)), 765432) == 765432
+        records = [('a', 1), ('b', 4), ('c', 9)]
+        assert searching.binary_search_iterative(records, 4, key=lambda r: r[1]) == 1
+    
+    def test_bounds_and_ranges(self):
+        arr = [1, 2, 2, 2, 3, 5, 8]
+        assert searching.lower_bound(arr, 2) == 1
+        assert searching.upper_bound(arr, 2) == 4
+        assert searching.equal_range(arr, 2) == (1, 4)
+        assert searching.equal_range(arr, 4) == (5, 5)
+        assert searching.lower_bound(arr, 9) == len(arr)
+        assert searching.count_in_range(arr, 2, 5) == 4
+        assert searching.count_in_range(arr, 5, 2) == 0
+        records = [('x', 1), ('y', 3), ('z', 3), ('w', 7)]
+        
+        def by_rank(record):
+            return record[1]
+        
+        assert searching.equal_range(records, 3, key=by_rank) == (1, 3)
+        assert searching.count_in_range(records, 2, 8, key=by_rank) == 3
+    
+    def test_interpolation_search(self):
+        assert searching.interpolation_search([1, 2, 4, 5, 7, 9], 7) == 4
+        assert searching.interpolation_search([1, 2, 4, 5, 7, 9], 10) == -1
+        assert searching.interpolation_search([1, 2, 4, 5, 7, 9], 3) == -1
+        assert searching.interpolation_search([], 3) == -1
+        skewed = [2 ** i for i in range(200)]
+        assert searching.interpolation_search(skewed, 2 ** 57) == 57
+        timestamps = [1.5 * i for i in range(1000)]
+        assert searching.interpolation_search(timestamps, 1.5 * 640) == 640
+        rng = np.random.default_rng(13)
+        nanoseconds = np.sort(1_700_000_000_000_000_000 + rng.integers(0, 10**15, 10**5))
+        assert searching.choose_search(nanoseconds) is searching.interpolation_search
+        for i in range(0, 10**5, 997):
+            found = searching.interpolation_search(nanoseconds, nanoseconds[i])
+            assert found != -1 and nanoseconds[found] == nanoseconds[i]
+    
+    def test_exponential_search(self):
+        assert searching.exponential_search([1, 2, 4, 5, 7, 9], 7) == 4
+        assert searching.exponential_search([1, 2, 4, 5, 7, 9], 1) == 0
+        assert searching.exponential_search([1, 2, 4, 5, 7, 9], 10) == -1
+        assert searching.exponential_search([], 1) == -1
+        
+        class Unbounded:
+            def __getitem__(self, i):
+                if i >= 10**6:
+                    raise IndexError(i)
+                return 2 * i
+        
+        assert searching.exponential_search(Unbounded(), 2 * 777) == 777
+        assert searching.exponential_search(Unbounded(), 3) == -1
+    
+    def test_choose_search(self):
+        rng = random.Random(15)
+        uniform = sorted(rng.randint(0, 10**9) for _ in range(10**4))
+        skewed = [2 ** (i // 100) for i in range(10**4)]
+        assert searching.choose_search(uniform) is searching.interpolation_search
+        assert searching.choose_search(skewed) is searching.binary_search
+        assert searching.choose_search(sorted("interpolation" * 5)) is searching.binary_search
+    
+    def test_eytzinger_index(self):
+        rng = np.random.default_rng(16)
+        for size in (0, 1, 2, 7, 8, 1000, 1025):
+            values = np.sort(rng.integers(0, 300, size))
+            index = searching.EytzingerIndex(values)
+            targets = np.arange(-5, 310)
+            expected = np.searchsorted(values, targets)
+            assert len(index) == size
+            assert np.array_equal(index.lower_bound(targets), expected)
+            hits = searching.binary_search_batch(values, targets, mode="first")
+            assert np.array_equal(index.search(targets), hits)
+        floats = searching.EytzingerIndex([0.5, 1.5, 2.5])
+        assert floats.search([1.5, 2.0]).tolist() == [1, -1]
+    
+    def test_linear_search_index(self):
+        rng = random.Random(17)
+        model = [rng.randint(0, 9) for _ in range(50)]
+        index = searching.LinearSearchIndex(model)
+        for _ in range(300):
+            op, value = rng.randrange(4), rng.randint(0, 11)
+            if op == 0:
+                model.append(value)
+                index.append(value)
+            elif op == 1:
+                i = rng.randrange(-len(model), len(model))
+                model[i] = index[i] = value
+            elif op == 2:
+                i = rng.randrange(len(model))
+                assert index.pop(i) == model.pop(i)
+            else:
+                i = rng.randint(0, len(model))
+                model.insert(i, value)
+                index.insert(i, value)
+            target = rng.randint(0, 11)
+            assert index.find(target) == searching.linear_search(model, target)
+            assert index.find_all(target) == [i for i, x in enumerate(model) if x == target]
+        assert searching.LinearSearchIndex([[1], [2]]).find([2]) == 1
+        
+        small = searching.LinearSearchIndex([1, 2, 3])
+        small.find(2)
+        with pytest.raises(IndexError):
+            small[-5] = 9
+        assert small.find(2) == 1 and small.find(9) == -1
+        small[-2] = 9
+        assert small.find(9) == 1
+        small.extend(small)
+        assert list(small) == [1, 9, 3, 1, 9, 3] and small.find_all(9) == [1, 4]
+    
+    def test_adaptive_linear_search(self):
+        rng = random.Random(18)
+        values = tuple(rng.randint(0, 100) for _ in range(500))
+        for target in range(120):
+            expected = searching.linear_search(values, target)
+            assert searching.adaptive_linear_search(values, target, threshold=4) == expected
+        
+        # Lists are scanned every time, so in-place edits are always seen.
+        arr = list(values)
+        for _ in range(20):
+            searching.adaptive_linear_search(arr, 5)
+        arr[0] = 1000
+        assert searching.adaptive_linear_search(arr, 1000) == 0
+        wrapped = searching.LinearSearchIndex(arr)
+        wrapped[1] = 2000
+        assert searching.adaptive_linear_search(wrapped, 2000) == 1
+        
+        nan = float('nan')
+        for seq in ((1.0, nan, 3.0), searching.LinearSearchIndex([1.0, nan, 3.0])):
+            for _ in range(10):
+                assert searching.adaptive_linear_search(seq, nan, threshold=2) == -1
+            assert searching.adaptive_linear_search(seq, 3.0, threshold=2) == 2
+        searching.clear_linear_search_cache()
+        assert searching.adaptive_linear_search(([1], [2]), [2], threshold=1) == 1
+        
+        big = range(3 * 10**7)
+        for _ in range(10):
+            assert searching.adaptive_linear_search(big, 5) == 5
+        assert searching.adaptive_linear_search(big, -1) == -1
+        
+        # The cache keeps the most recently used sequences, not the oldest.
+        searching.clear_linear_search_cache()
+        first = tuple(range(10))
+        searching.adaptive_linear_search(first, 3)
+        for i in range(searching.LINEAR_INDEX_CACHE_SIZE):
+            searching.adaptive_linear_search(first, 3)
+            searching.adaptive_linear_search(tuple(range(i + 20)), 3)
+        assert id(first) in searching._linear_indexes
+    
+    def test_mapped_sorted_file(self, tmp_path):
+        rng = np.random.default_rng(19)
+        dtype = np.dtype([('id', '<u4'), ('key', '>i8')])
+        records = np.zeros(1000, dtype)
+        records['key'] = np.sort(rng.integers(-100, 100, 1000))
+        records['id'] = np.arange(1000)
+        path = tmp_path / "records.bin"
+        records.tofile(path)
+        keys = records['key']
+        for stride in (None, 16):
+            table = searching.MappedSortedFile(path, dtype=dtype, key='key', fence_stride=stride)
+            with table:
+                assert len(table) == 1000
+                assert table[-1]['id'] == 999
+                for target in range(-105, 105):
+                    first = int(np.searchsorted(keys, target))
+                    expected = first if target in keys else -1
+                    assert table.lower_bound(target) == first
+                    assert table.upper_bound(target) == np.searchsorted(keys, target, 'right')
+                    assert table.find_first_occurrence(target) == expected
+                    hit = table.binary_search(target)
+                    assert hit == -1 if expected == -1 else keys[hit] == target
+        packed = tmp_path / "packed.bin"
+        pairs = records[['id', 'key']].tolist()
+        packed.write_bytes(b"".join(struct.pack('<Iq', i, k) for i, k in pairs))
+        table = searching.MappedSortedFile(packed, fmt='<Iq', key=1, fence_stride=7)
+        assert table.count_in_range(-10, 10) == np.count_nonzero((keys >= -10) & (keys < 10))
+        table.close()
+        
+        # 'S' keys compare as NumPy reads them, without trailing nulls.
+        names = np.array([b'a', b'ab', b'ab', b'abcd', b'b'], dtype='S4')
+        path = tmp_path / "names.bin"
+        names.tofile(path)
+        with searching.MappedSortedFile(path, dtype='S4', fence_stride=2) as table:
+            assert table.key_at(1) == names[1] == b'ab'
+            assert table.find_first_occurrence(b'ab') == 1
+            assert table.count_in_range(b'ab', b'b') == 3
+            assert table.binary_search(b'abc') == -1
 
 
 class TestRecursion:
@@ -69,15 +509,70 @@ class TestRecursion:
         assert recursion.fibonacci(5) == 5
         assert recursion.fibonacci(10) == 55
     
+    def test_fibonacci_fast(self):
+        expected = [0, 1]
+        for _ in range(2000):
+            expected.append(expected[-1] + expected[-2])
+        rng = random.Random(20)
+        for n in [rng.randrange(2000) for _ in range(500)] + list(range(30)):
+            assert recursion.fibonacci_fast(n) == expected[n]
+        assert recursion.fibonacci(25, mode="fast") == expected[25]
+        assert dynamic_programming.fibonacci_dp(1999, mode="fast") == expected[1999]
+        with pytest.raises(ValueError):
+            recursion.fibonacci_fast(-1)
+    
     def test_factorial(self):
         assert recursion.factorial(0) == 1
         assert recursion.factorial(5) == 120
         assert recursion.factorial(10) == 3628800
     
+    def test_factorial_fast(self):
+        expected = 1
+        for n in range(1200):
+            if n:
+                expected *= n
+            assert recursion.factorial_fast(n) == expected
+        assert recursion.factorial(300, mode="fast") == recursion.factorial(300, mode="iterative")
+        with pytest.raises(ValueError):
+            recursion.factorial_fast(-1)
+    
     def test_power(self):
         assert recursion.power(2, 3) == 8
         assert recursion.power(5, 0) == 1
         assert recursion.power(3, 4) == 81
+        assert recursion.power(2, 2000) == 2 ** 2000
+        assert recursion.power(3, 40, mode="recursive") == 3 ** 40
+    
+    def test_fast_power(self):
+        assert recursion.power(3, 10**4, mode="fast") == 3 ** 10**4
+        assert recursion.power(3, 10**18, mod=10**9 + 7) == pow(3, 10**18, 10**9 + 7)
+        assert recursion.fast_power(3, -1, mod=7) == 5
+        assert recursion.fast_power(2.0, -2) == 0.25
+        rng = random.Random(22)
+        for _ in range(50):
+            size = rng.randint(1, 4)
+            matrix = [[rng.randint(-3, 3) for _ in range(size)] for _ in range(size)]
+            exponent = rng.randint(0, 40)
+            expected = np.linalg.matrix_power(np.array(matrix, dtype=object), exponent)
+            for window in (1, 2, 5):
+                assert recursion.fast_power(matrix, exponent, window=window) == expected.tolist()
+            assert recursion.fast_power(matrix, exponent, mod=97) == (expected % 97).tolist()
+            as_array = np.array(matrix, dtype=np.int64)
+            assert np.array_equal(recursion.fast_power(as_array, exponent, mod=97), expected % 97)
+        floats = np.array([[2.0, 1.0], [1.0, 1.0]])
+        inverse = recursion.fast_power(floats, -3)
+        assert np.allclose(inverse @ recursion.fast_power(floats, 3), np.eye(2))
+    
+    def test_linear_recurrence(self):
+        for n in range(0, 500, 7):
+            expected = recursion.fibonacci_fast(n)
+            assert recursion.linear_recurrence([1, 1], [0, 1], n) == expected
+            assert recursion.linear_recurrence([1, 1], [0, 1], n, mod=1000) == expected % 1000
+        tribonacci = [0, 0, 1]
+        for _ in range(30):
+            tribonacci.append(sum(tribonacci[-3:]))
+        computed = [recursion.linear_recurrence([1, 1, 1], [0, 0, 1], n) for n in range(33)]
+        assert computed == tribonacci
     
     def test_sum_digits(self):
         assert recursion.sum_digits(123) == 6
@@ -93,6 +588,143 @@ class TestRecursion:
         moves = recursion.tower_of_hanoi(2, 'A', 'C', 'B')
         assert moves == [('A', 'B'), ('A', 'C'), ('B', 'C')]
         assert len(recursion.tower_of_hanoi(3, 'A', 'C', 'B')) == 7
+    
+    def test_iterative_mode(self):
+        for n in range(15):
+            assert recursion.fibonacci(n, mode="iterative") == recursion.fibonacci(n)
+            assert recursion.factorial(n, mode="iterative") == recursion.factorial(n)
+            assert recursion.power(3, n, mode="iterative") == recursion.power(3, n)
+        for n in range(1, 9):
+            expected = recursion.tower_of_hanoi(n, 'A', 'C', 'B')
+            assert recursion.tower_of_hanoi(n, 'A', 'C', 'B', mode="iterative") == expected
+        rng = random.Random(21)
+        for _ in range(50):
+            n = rng.getrandbits(rng.randint(1, 2000))
+            assert recursion.sum_digits(n, mode="iterative") == sum(map(int, str(n)))
+        assert recursion.sum_digits(10**10000 - 1, mode="iterative") == 90000
+        assert recursion.factorial(5000, mode="iterative") % 10**1000 == 0
+        assert recursion.reverse_string("ab" * 10**5, mode="iterative") == "ba" * 10**5
+        with pytest.raises(ValueError):
+            recursion.reverse_string("abc", mode="tail")
+    
+    def test_hanoi_lazy(self):
+        for n in range(1, 9):
+            expected = recursion.tower_of_hanoi(n, 'A', 'C', 'B')
+            assert list(recursion.tower_of_hanoi(n, 'A', 'C', 'B', mode="generator")) == expected
+            assert list(recursion.hanoi_moves(n, 'A', 'C', 'B', start=5)) == expected[5:]
+            pegs = {'A': list(range(n, 0, -1)), 'B': [], 'C': []}
+            for k, move in enumerate(expected):
+                assert recursion.hanoi_state(n, k, 'A', 'C', 'B') == pegs
+                assert recursion.hanoi_move(n, k, 'A', 'C', 'B') == move
+                pegs[move[1]].append(pegs[move[0]].pop())
+            assert recursion.hanoi_state(n, len(expected), 'A', 'C', 'B') == pegs
+        assert recursion.hanoi_state(64, 2**64 - 1, 'A', 'C', 'B')['C'] == list(range(64, 0, -1))
+        assert recursion.hanoi_move(64, 2**63 - 1, 'A', 'C', 'B') == ('A', 'C')
+        with pytest.raises(IndexError):
+            recursion.hanoi_move(3, 7, 'A', 'C', 'B')
+    
+    def test_trampoline(self):
+        def factorial(n):
+            if n <= 1:
+                return 1
+            return n * (yield factorial(n - 1))
+        
+        assert recursion.trampoline(factorial(5000)) == recursion.factorial(5000, mode="iterative")
+
+
+class TestMemoization:
+    """Test the memoize decorator"""
+    
+    def test_eviction_policies(self):
+        for policy, survivors in (("lru", [4, 5, 1]), ("lfu", [1, 2, 5])):
+            calls = []
+            
+            @memoization.memoize(maxsize=3, policy=policy)
+            def square(x):
+                calls.append(x)
+                return x * x
+            
+            for x in [1, 1, 1, 2, 2, 3, 4, 5, 1]:
+                assert square(x) == x * x
+            expected_keys = {memoization._make_key((x,), {}) for x in survivors}
+            assert set(square.cache._values) == expected_keys
+            info = square.cache_info()
+            assert info.hits + info.misses == 9 and info.misses == len(calls)
+            assert info.evictions == len(calls) - 3
+        
+        @memoization.memoize(maxsize=None, maxbytes=1000)
+        def identity(x):
+            return x
+        
+        for x in range(100):
+            identity(x)
+        assert 0 < identity.cache_info().bytes <= 1000
+    
+    def test_lfu_admits_new_keys(self):
+        @memoization.memoize(maxsize=2, policy="lfu")
+        def upper(s):
+            return s.upper()
+        
+        for s in "aabb" + "c" * 10:
+            upper(s)
+        info = upper.cache_info()
+        assert info.misses == 3 and info.hits == 11
+        assert memoization._make_key(("c",), {}) in upper.cache._values
+    
+    def test_argument_normalization(self):
+        calls = []
+        
+        @memoization.memoize
+        def total(values, scale=1):
+            calls.append(values)
+            return sum(values) * scale
+        
+        assert total([1, 2]) == total([1, 2]) == 3
+        assert total((1, 2)) == 3 and total([1, 2], scale=2) == 6
+        assert len(calls) == 3
+        
+        class Unhashable:
+            __hash__ = None
+            
+            def __iter__(self):
+                return iter([5])
+        
+        assert total(Unhashable()) == total(Unhashable()) == 5
+        assert len(calls) == 5
+    
+    def test_persistence(self, tmp_path):
+        path = tmp_path / "cache.pkl"
+        
+        @memoization.memoize(path=path)
+        def double(x):
+            return 2 * x
+        
+        double(1), double([2, 3])
+        double.cache_save()
+        
+        @memoization.memoize(path=path)
+        def reloaded(x):
+            raise AssertionError("should be served from the cache")
+        
+        assert reloaded(1) == 2 and reloaded([2, 3]) == [2, 3, 2, 3]
+    
+    def test_memoized_recursion(self):
+        assert recursion.fibonacci(200) == recursion.fibonacci_fast(200)
+        assert recursion.fibonacci.cache_info().hits > 0
+        assert recursion.factorial(20) == 2432902008176640000
+        assert recursion.power(3, 40) == 3 ** 40
+        assert recursion.power(2, 3) == 8 and isinstance(recursion.power(2.0, 3), float)
+        matrix = recursion.power([[1, 1], [1, 0]], 5, mode="fast")
+        matrix[0][0] = 99
+        assert recursion.power([[1, 1], [1, 0]], 5, mode="fast") == [[8, 5], [5, 3]]
+    
+    def test_memoized_recursion_depth(self):
+        # The memoize wrapper must not add a frame per level of recursion.
+        for func in (recursion.fibonacci, recursion.factorial, recursion.power):
+            func.cache_clear()
+        assert recursion.fibonacci(900) == recursion.fibonacci_fast(900)
+        assert recursion.factorial(900) == recursion.factorial_fast(900)
+        assert recursion.power(2, 900, mode="recursive") == 2 ** 900
 
 
 class TestDynamicProgramming:
@@ -106,6 +738,55 @@ class TestDynamicProgramming:
         assert dynamic_programming.knapsack_01([1, 2, 3], [10, 15, 40], 5) == 55
         assert dynamic_programming.knapsack_01([2, 3, 4, 5], [3, 4, 5, 6], 5) == 7
     
+    def test_knapsack_rolling(self):
+        assert dynamic_programming.knapsack_01([1, 2, 3], [10, 15, 40], 5, mode="rolling") == 55
+        rng = random.Random(24)
+        for _ in range(200):
+            n = rng.randint(0, 8)
+            weights = [rng.randint(0, 10) for _ in range(n)]
+            values = [rng.randint(0, 20) for _ in range(n)]
+            capacity = rng.randint(0, 30)
+            expected = dynamic_programming.knapsack_01(weights, values, capacity)
+            best, items = dynamic_programming.knapsack_01_rolling(weights, values, capacity,
+                                                                  return_items=True)
+            assert best == expected
+            assert sum(weights[i] for i in items) <= capacity
+            assert sum(values[i] for i in items) == expected
+        assert dynamic_programming.knapsack_01_rolling([1, 1], [0.5, 1.25], 1) == 1.25
+        # Each value fits in int64 but their sum does not.
+        assert dynamic_programming.knapsack_01_rolling([1, 1], [2**62, 2**62], 2) == 2**63
+        assert dynamic_programming.knapsack_01_rolling([], [], 3, return_items=True) == (0, [])
+    
+    def test_knapsack_engines(self):
+        rng = random.Random(25)
+        for _ in range(200):
+            n = rng.randint(0, 10)
+            weights = [rng.randint(0, 10) for _ in range(n)]
+            values = [rng.randint(-3, 20) for _ in range(n)]
+            capacity = rng.randint(0, 30)
+            expected = dynamic_programming.knapsack_01(weights, values, capacity)
+            for mode in ("value", "meet_in_middle", "auto"):
+                result = dynamic_programming.knapsack_01(weights, values, capacity, mode=mode)
+                assert result == expected
+        
+        heavy = [rng.randint(10**8, 10**9) for _ in range(30)]
+        small_values = [rng.randint(1, 50) for _ in range(30)]
+        assert dynamic_programming.knapsack_engine(heavy, small_values, sum(heavy) // 2) == "value"
+        large_values = [rng.randint(10**6, 10**7) for _ in range(30)]
+        engine = dynamic_programming.knapsack_engine(heavy, large_values, sum(heavy) // 2)
+        assert engine == "meet_in_middle"
+        assert dynamic_programming.knapsack_engine([3] * 100, [10**6] * 100, 50) == "rolling"
+        overflow = dynamic_programming.knapsack_01_meet_in_middle([1] * 3, [2**62] * 3, 3)
+        assert overflow == 3 * 2**62
+        # Capacity far beyond the total weight must not size the rolling row.
+        huge = 10**12
+        total = dynamic_programming.knapsack_01([1] * 50, [10**6] * 50, huge, mode="auto")
+        assert total == 50 * 10**6
+        rolled = dynamic_programming.knapsack_01_rolling([2, 5], [3, 4], huge, return_items=True)
+        assert rolled == (7, [0, 1])
+        assert dynamic_programming.knapsack_01_by_value(heavy, small_values, sum(heavy) // 2) == \
+            dynamic_programming.knapsack_01_meet_in_middle(heavy, small_values, sum(heavy) // 2)
+    
     def test_longest_common_subsequence(self):
         assert dynamic_programming.longest_common_subsequence("AGGTAB", "GXTXAYB") == 4
         assert dynamic_programming.longest_common_subsequence("ABC", "ABC") == 3
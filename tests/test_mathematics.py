@@ -2,7 +2,9 @@
 Tests for mathematics solutions
 """
 
+import math
 import pytest
+import random
 import sys
 from pathlib import Path
 
@@ -48,6 +50,24 @@ class TestNumberTheory:
     def test_nth_fibonacci_modulo(self):
         assert number_theory.nth_fibonacci_modulo(10, 1000) == 55
         assert number_theory.nth_fibonacci_modulo(100, 100) == 75
+    
+    def test_binomial(self):
+        for n in range(40):
+            for k in range(n + 1):
+                assert number_theory.binomial(n, k) == math.comb(n, k)
+        assert number_theory.binomial(5, 6) == 0
+        assert number_theory.binomial(5, -1) == 0
+        assert number_theory.binomial(20000, 9000) == math.comb(20000, 9000)
+    
+    def test_multinomial(self):
+        rng = random.Random(23)
+        for _ in range(50):
+            counts = [rng.randint(0, 40) for _ in range(rng.randint(1, 5))]
+            expected = math.factorial(sum(counts))
+            for c in counts:
+                expected //= math.factorial(c)
+            assert number_theory.multinomial(counts) == expected
+        assert number_theory.multinomial([]) == 1
 
 
 class TestGeometry: